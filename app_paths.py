@@ -0,0 +1,19 @@
+import os
+import sys
+
+APP_NAME = "ModLoader"
+
+
+def get_cache_dir(*subdirs):
+    # MODLOADER_CACHE_DIR erlaubt einen eigenen Ort (z.B. für Benchmarks oder portable Installationen)
+    base = os.environ.get("MODLOADER_CACHE_DIR")
+    if not base:
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(root, APP_NAME)
+
+    path = os.path.join(base, *subdirs)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from app_paths import get_cache_dir
+
+DEFAULT_MAX_MB = 2048
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArchiveCache:
+    # Heruntergeladene Mod-Archive nach Inhalt (SHA-256) ablegen; Schlüssel ist ZIP-Name + Remote-Version.
+    # Über der Größengrenze fliegen die am längsten nicht benutzten Archive raus – außer denen, die lookup/store
+    # gerade ausgegeben haben: diese bleiben bis zum release() nach der Installation gesperrt. Ebenso bleiben
+    # die per protect() geschützten Schlüssel (vorgeladene, noch ausstehende Updates) liegen.
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or get_cache_dir("archives")
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("MODLOADER_ARCHIVE_CACHE_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._pins = {}  # sha256 -> Anzahl ausgegebener, noch nicht freigegebener Pfade
+        self._protected = set()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                return json.load(file)["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save(self):
+        temp_path = f"{self.index_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"entries": self._entries}, file)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Archiv-Cache-Index konnte nicht gespeichert werden: {e}")
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.cache_dir, f"{sha256}.zip")
+
+    @staticmethod
+    def _key(zip_filename, version):
+        return f"{zip_filename}|{version}"
+
+    def contains_path(self, path):
+        return os.path.normpath(os.path.dirname(path)) == os.path.normpath(self.cache_dir)
+
+    def size_of(self, zip_filename, version):
+        # Schnelle Prüfung ohne Prüfsumme (die folgt erst beim eigentlichen lookup); None, wenn nicht im Cache
+        if not version:
+            return None
+        with self._lock:
+            entry = self._entries.get(self._key(zip_filename, version))
+        if entry is None or not os.path.exists(self._blob_path(entry["sha256"])):
+            return None
+        return entry["size"]
+
+    def protect(self, archives):
+        # Ersetzt die geschützten Archive (Paare aus ZIP-Name und Version); was herausfällt, darf wieder weichen
+        with self._lock:
+            self._protected = {self._key(zip_filename, version) for zip_filename, version in archives if version}
+            self._evict()
+            self._save()
+
+    def lookup(self, zip_filename, version):
+        # Liefert den Pfad nur, wenn Größe und Prüfsumme noch stimmen
+        if not version:
+            return None
+        key = self._key(zip_filename, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            # Schon vor dem Prüfen sperren, sonst könnte ein store() aus einem anderen Thread den Blob verdrängen
+            sha256 = entry["sha256"]
+            self._pin(sha256)
+
+        blob_path = self._blob_path(sha256)
+        try:
+            valid = os.path.getsize(blob_path) == entry["size"] and file_sha256(blob_path) == sha256
+        except OSError:
+            valid = False
+
+        with self._lock:
+            if not valid:
+                print(f"⚠️ Archiv im Cache beschädigt, wird verworfen: {zip_filename} ({version})")
+                self._unpin(sha256)
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self._remove_blob_if_unused(sha256)
+                self._save()
+                return None
+
+            entry["last_used"] = time.time()
+            self._save()
+        return blob_path
+
+    def store(self, zip_filename, version, source_path):
+        # Verschiebt die Datei in den Cache und gibt den neuen (gesperrten) Pfad zurück
+        if not version or self.max_bytes <= 0:
+            return source_path
+
+        sha256 = file_sha256(source_path)
+        size = os.path.getsize(source_path)
+        blob_path = self._blob_path(sha256)
+
+        with self._lock:
+            if os.path.exists(blob_path):
+                os.remove(source_path)  # gleicher Inhalt liegt schon vor
+            else:
+                os.replace(source_path, blob_path)
+            self._entries[self._key(zip_filename, version)] = {
+                "sha256": sha256,
+                "size": size,
+                "last_used": time.time(),
+            }
+            self._pin(sha256)
+            self._evict()
+            self._save()
+        return blob_path
+
+    def release(self, path):
+        # Gegenstück zu lookup/store, sobald das Archiv nicht mehr gebraucht wird
+        if not self.contains_path(path):
+            return
+        sha256 = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            if not self._unpin(sha256):
+                return
+            # Solange gesperrt war, durfte der Cache über die Grenze wachsen
+            self._evict()
+            self._save()
+
+    def _pin(self, sha256):
+        self._pins[sha256] = self._pins.get(sha256, 0) + 1
+
+    def _unpin(self, sha256):
+        # True, sobald die letzte Sperre weg ist
+        count = self._pins.get(sha256, 0) - 1
+        if count > 0:
+            self._pins[sha256] = count
+            return False
+        self._pins.pop(sha256, None)
+        return True
+
+    def _evict(self):
+        # Jeder Blob zählt nur einmal, auch wenn mehrere Schlüssel darauf zeigen
+        blobs = {}
+        for entry in self._entries.values():
+            blob = blobs.setdefault(entry["sha256"], {"size": entry["size"], "last_used": 0})
+            blob["last_used"] = max(blob["last_used"], entry["last_used"])
+
+        protected = {self._entries[key]["sha256"] for key in self._protected if key in self._entries}
+        total = sum(blob["size"] for blob in blobs.values())
+        for sha256, blob in sorted(blobs.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if sha256 in self._pins or sha256 in protected:
+                continue
+            for key in [key for key, entry in self._entries.items() if entry["sha256"] == sha256]:
+                del self._entries[key]
+            self._remove_blob_if_unused(sha256)
+            total -= blob["size"]
+
+    def _remove_blob_if_unused(self, sha256):
+        if sha256 in self._pins or any(entry["sha256"] == sha256 for entry in self._entries.values()):
+            return
+        try:
+            os.remove(self._blob_path(sha256))
+        except OSError:
+            pass  # unter Windows evtl. noch geöffnet – verwaist, stört aber nicht
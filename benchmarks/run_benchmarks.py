@@ -0,0 +1,300 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Benchmarks der heißen Pfade mit synthetischen Daten und lokalem Katalog-/Download-Server.
+#   python benchmarks/run_benchmarks.py --sizes 1000,10000,50000
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/alt.json
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic  # noqa: E402
+
+
+def best_of(func, repeats=3):
+    # Bestes Ergebnis zählt, Ausreißer durch GC/Scheduler fallen so raus
+    durations = []
+    result = None
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            durations.append(time.perf_counter() - start)
+    return min(durations), result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_local_scan(results, datasets):
+    from get_local_mods import get_mods_versions
+    from main import ModViewer
+    from app_paths import get_cache_dir
+
+    for size, dataset in datasets.items():
+        # Kalt: ohne persistierten Index
+        shutil.rmtree(get_cache_dir("local_index"), ignore_errors=True)
+        results[f"get_mods_versions.cold[{size}]"], _ = best_of(
+            lambda: get_mods_versions(dataset["mods_folder"]), repeats=1)
+        results[f"get_mods_versions.warm[{size}]"], mods_local = best_of(
+            lambda: get_mods_versions(dataset["mods_folder"]))
+        dataset["mods_local"] = mods_local
+
+        # get_combined_mod_list nutzt self nicht
+        results[f"get_combined_mod_list[{size}]"], combined = best_of(
+            lambda: ModViewer.get_combined_mod_list(None, dataset["catalog"]["mods"], mods_local))
+        dataset["combined"] = combined
+        print(f"  {size} Mods: Scan und Abgleich gemessen ({len(combined)} kombiniert)")
+
+
+SEARCH_QUERIES = ["b", "be", "bench", "benchmark mod", "benchmark mod 1", "benchmark mod 12", "autor 4",
+                  "autor 42 mod 7", "bench_mod_7", "xyz"]
+SEARCH_TARGET_MS = 10
+
+
+def bench_catalog_search(results, datasets):
+    from catalog_search import CatalogSearchIndex
+
+    for size, dataset in datasets.items():
+        entries = dataset["catalog"]["mods"]
+        results[f"catalog_index.build[{size}]"], _ = best_of(lambda: CatalogSearchIndex(entries), repeats=1)
+
+        # Erster Tastendruck je Suchbegriff auf frischem Index, also ohne Präfix-Cache
+        search_index = CatalogSearchIndex(entries)
+        slowest = 0.0
+        for query in SEARCH_QUERIES:
+            start = time.perf_counter()
+            search_index.search(query)
+            slowest = max(slowest, time.perf_counter() - start)
+        results[f"catalog_search.slowest[{size}]"] = slowest
+        marker = "⚠️" if slowest * 1000 > SEARCH_TARGET_MS else "✅"
+        print(f"  {marker} {len(entries)} Katalogeinträge: langsamste Suche {slowest * 1000:.1f} ms "
+              f"(Ziel: {SEARCH_TARGET_MS} ms)")
+
+
+def bench_gui(results, datasets):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import main
+
+    main.check_for_update = lambda current_version: (False, None, None)
+    first_dataset = next(iter(datasets.values()))
+    main.get_mod_folder_from_settings = lambda: first_dataset["mods_folder"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        viewer = main.ModViewer()
+        viewer.show()
+        # Start-Refresh gegen den lokalen Server abwarten, damit er die Messung nicht stört
+        deadline = time.perf_counter() + 60
+        while viewer.first_paint_seconds is None and time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        while viewer._refresh_worker is not None and time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+
+    for size, dataset in datasets.items():
+        combined = dataset["combined"]
+
+        def populate():
+            viewer.populate_mod_table(combined)
+            app.processEvents()
+
+        def highlight():
+            viewer.highlight_update_rows(combined)
+            app.processEvents()
+
+        results[f"populate_mod_table[{size}]"], _ = best_of(populate)
+        results[f"highlight_update_rows[{size}]"], _ = best_of(highlight)
+        print(f"  {size} Mods: Tabelle gemessen")
+
+    viewer.close()
+
+
+STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import main
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtWidgets import QApplication
+main.check_for_update = lambda current_version: (False, None, None)
+main.get_mod_folder_from_settings = lambda: {mods_folder!r}
+app = QApplication(sys.argv)
+viewer = main.ModViewer()
+viewer.show()
+while viewer.first_paint_seconds is None:
+    app.processEvents()
+    time.sleep(0.001)
+print("first_paint=%r" % viewer.first_paint_seconds)
+viewer.cancel_refresh()
+QThreadPool.globalInstance().waitForDone()
+"""
+
+
+def bench_startup(results, datasets, repeats=3):
+    # Eigener Prozess je Lauf, damit Importe wirklich kalt gemessen werden
+    from main import FIRST_PAINT_TARGET_MS
+
+    first_dataset = next(iter(datasets.values()))
+    script = STARTUP_SCRIPT.format(root=ROOT_DIR, mods_folder=first_dataset["mods_folder"])
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    durations = []
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True,
+                                   timeout=60, check=True)
+        durations.extend(float(line.split("=", 1)[1]) for line in completed.stdout.splitlines()
+                         if line.startswith("first_paint="))
+
+    results["startup.first_paint"] = min(durations)
+    marker = "⚠️" if results["startup.first_paint"] * 1000 > FIRST_PAINT_TARGET_MS else "✅"
+    print(f"  {marker} Erstes Bild nach {results['startup.first_paint'] * 1000:.0f} ms "
+          f"(Ziel: {FIRST_PAINT_TARGET_MS} ms)")
+
+
+def bench_updates(results, workdir, archives, catalog_entries):
+    import mod_updater
+
+    mod_updater.configure_archive_cache(0)  # jeder Lauf soll wirklich laden
+    mods_folder = os.path.join(workdir, "update_mods")
+    os.makedirs(mods_folder, exist_ok=True)
+    jobs = [(zip_filename, zip_filename.replace(".zip", ""), entry["version"])
+            for zip_filename, entry in zip(archives, catalog_entries)]
+    total_bytes = sum(len(data) for data in archives.values())
+
+    def single_updates():
+        return [mod_updater.update_mod(mods_folder, zip_filename, filename_without_zip, delta=False)
+                for zip_filename, filename_without_zip, _ in jobs]
+
+    def bulk_update():
+        return mod_updater.BulkUpdater(mods_folder, delta=False).run(jobs)
+
+    duration, outcome = best_of(single_updates, repeats=1)
+    results["update_mod.single.seconds"] = duration
+    results["update_mod.single.mb_per_s"] = total_bytes / duration / (1024 * 1024)
+    results["update_mod.single.failed"] = outcome.count(False)
+
+    duration, outcome = best_of(bulk_update, repeats=1)
+    results["update_mod.bulk.seconds"] = duration
+    results["update_mod.bulk.mb_per_s"] = total_bytes / duration / (1024 * 1024)
+    results["update_mod.bulk.failed"] = sum(1 for success in outcome.values() if not success)
+    print(f"  {len(jobs)} Archive ({total_bytes / (1024 * 1024):.1f} MB): Einzel- und Sammel-Update gemessen")
+
+
+def compare(previous_path, results):
+    with open(previous_path, "r", encoding="utf-8") as file:
+        previous = json.load(file)["results"]
+
+    print(f"\nVergleich mit {previous_path}:")
+    for key in sorted(results):
+        if key not in previous or not previous[key]:
+            continue
+        ratio = results[key] / previous[key]
+        # Bei Durchsatz ist größer besser, bei Zeiten kleiner
+        worse = ratio < 0.9 if key.endswith("mb_per_s") else ratio > 1.1
+        marker = "⚠️" if worse else "  "
+        print(f"{marker} {key:45s} {previous[key]:10.4f} -> {results[key]:10.4f} ({ratio:5.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für den Mod Loader")
+    parser.add_argument("--sizes", default="1000,10000", help="Anzahl installierter Mods, kommagetrennt")
+    parser.add_argument("--archives", type=int, default=20, help="Anzahl Archive für den Update-Benchmark")
+    parser.add_argument("--archive-kb", type=int, default=1024, help="Größe je Archiv in KB")
+    parser.add_argument("--output", help="Ergebnisdatei (Standard: benchmarks/results/<datum>-<commit>.json)")
+    parser.add_argument("--compare", help="Frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument("--skip-gui", action="store_true")
+    parser.add_argument("--skip-updates", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="Synthetische Daten nicht löschen")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    workdir = tempfile.mkdtemp(prefix="modloader-bench-")
+    os.environ["MODLOADER_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+    try:
+        print("Erzeuge synthetische Daten...")
+        datasets = {}
+        for size in sizes:
+            catalog = synthetic.build_catalog(size)
+            mods_folder = os.path.join(workdir, f"mods_{size}")
+            synthetic.build_mod_tree(mods_folder, catalog, size)
+            datasets[size] = {"catalog": catalog, "mods_folder": mods_folder}
+
+        update_entries = datasets[sizes[0]]["catalog"]["mods"][:args.archives]
+        archives = {}
+        for index, entry in enumerate(update_entries):
+            folder = entry["files"][0]["foldername"]
+            archives[entry["files"][0]["filename"]] = synthetic.build_zip(folder, entry["version"],
+                                                                          args.archive_kb * 1024, seed=index)
+
+        # Module lesen die URLs beim Import, daher Server vor dem ersten Import starten
+        server, base_url = synthetic.start_stand_in_server(datasets[sizes[0]]["catalog"], archives)
+        os.environ["MODLOADER_CATALOG_URL"] = f"{base_url}/tpfmm"
+        os.environ["MODLOADER_DOWNLOAD_URL"] = f"{base_url}/download/"
+
+        results = {}
+        print("Lokaler Scan und Abgleich...")
+        bench_local_scan(results, datasets)
+        print("Katalogsuche...")
+        bench_catalog_search(results, datasets)
+        if not args.skip_gui:
+            print("Programmstart (offscreen)...")
+            bench_startup(results, datasets)
+            print("Tabelle (offscreen)...")
+            bench_gui(results, datasets)
+        if not args.skip_updates:
+            print("Updates gegen lokalen Server...")
+            bench_updates(results, workdir, archives, update_entries)
+        server.shutdown()
+
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "results": results,
+        }
+
+        output = args.output
+        if not output:
+            os.makedirs(os.path.join(BENCH_DIR, "results"), exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output = os.path.join(BENCH_DIR, "results", f"{stamp}-{report['commit'] or 'local'}.json")
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+        print()
+        for key, value in results.items():
+            print(f"{key:45s} {value:10.4f}")
+        print(f"\nErgebnisse gespeichert: {output}")
+
+        if args.compare:
+            compare(args.compare, results)
+    finally:
+        if args.keep:
+            print(f"Synthetische Daten liegen in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
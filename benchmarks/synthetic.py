@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import random
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Erzeugt Mod-Ordner, einen passenden /tpfmm-Katalog und ZIP-Archive für die Benchmarks
+
+MOD_LUA_TEMPLATE = """function data()
+return {{
+    info = {{
+        minorVersion = {minor},
+        severityAdd = "NONE",
+        severityRemove = "WARNING",
+        name = _("{name}"),
+        description = _("Synthetischer Benchmark-Mod"),
+        authors = {{ {{ name = "Benchmark", role = "CREATOR" }} }},
+        tags = {{ "Europe", "Train" }},
+    }},
+    options = {{}},
+{padding}}}
+end
+"""
+
+
+def folder_name(index):
+    return f"bench_mod_{index}_{index % 3 + 1}"
+
+
+def build_catalog(mod_count, outdated_share=0.3, seed=42):
+    # Mehr Katalogeinträge als installierte Mods, wie in der Realität
+    rng = random.Random(seed)
+    mods = []
+    for index in range(int(mod_count * 1.5)):
+        major = index % 3 + 1
+        minor = rng.randint(0, 9)
+        if index < mod_count and rng.random() < outdated_share:
+            minor += 1
+        mods.append({
+            "name": f"Benchmark Mod {index}",
+            "author": f"Autor {rng.randint(0, 499)}",
+            "version": f"{major}.{minor}",
+            "timecreated": 1600000000 + index,
+            "timechanged": 1700000000 + index,
+            "description": "Lorem ipsum " * 20,
+            "files": [{"foldername": folder_name(index), "filename": f"{folder_name(index)}.zip"}],
+        })
+    return {"mods": mods}
+
+
+def build_mod_tree(mods_folder, catalog, mod_count, seed=42):
+    # Installiert sind die ersten mod_count Einträge, jeweils mit der Katalogversion minus ggf. 1
+    rng = random.Random(seed)
+    os.makedirs(mods_folder, exist_ok=True)
+    padding = "    -- Füllzeile\n" * 40
+    for index, mod in enumerate(catalog["mods"][:mod_count]):
+        minor = int(mod["version"].split(".")[1])
+        if rng.random() < 0.3:
+            minor = max(minor - 1, 0)
+        mod_path = os.path.join(mods_folder, folder_name(index))
+        os.makedirs(mod_path, exist_ok=True)
+        with open(os.path.join(mod_path, "mod.lua"), "w", encoding="utf-8") as file:
+            file.write(MOD_LUA_TEMPLATE.format(minor=minor, name=mod["name"], padding=padding))
+
+
+def build_zip(folder, version, payload_bytes, seed=0):
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        minor = version.split(".")[1]
+        zip_file.writestr(f"{folder}/mod.lua", MOD_LUA_TEMPLATE.format(minor=minor, name=folder, padding=""))
+        file_count = 8
+        for file_index in range(file_count):
+            # halb zufällig, halb komprimierbar – ähnlich wie Texturen und Lua-Dateien
+            chunk = payload_bytes // file_count
+            data = rng.randbytes(chunk // 2) + b"-- lua --\n" * (chunk // 20)
+            zip_file.writestr(f"{folder}/res/file_{file_index}.bin", data)
+    return buffer.getvalue()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    files = {}
+
+    def _resolve(self):
+        return self.files.get(self.path.split("?", 1)[0])
+
+    def do_HEAD(self):
+        body = self._resolve()
+        self.send_response(200 if body is not None else 404)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+
+    def do_GET(self):
+        body = self._resolve()
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = f'"{len(body)}-{hash(body) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end, status = 0, len(body), 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (None, etag):
+            first, last = range_header.split("=", 1)[1].split("-", 1)
+            start, status = int(first), 206
+            if last:
+                end = int(last) + 1
+
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(body)}")
+        self.end_headers()
+        self.wfile.write(body[start:end])
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(catalog, archives):
+    # archives: zip_filename -> Bytes; liefert (Server, Basis-URL)
+    handler = type("StandInHandler", (_StandInHandler,), {"files": {}})
+    handler.files["/tpfmm"] = json.dumps(catalog).encode("utf-8")
+    for zip_filename, data in archives.items():
+        handler.files[f"/download/{zip_filename}"] = data
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -0,0 +1,267 @@
+import codecs
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from app_paths import get_cache_dir
+from tracing import span
+
+# Überschreibbar, z.B. für Benchmarks gegen einen lokalen Server
+CATALOG_URL = os.environ.get("MODLOADER_CATALOG_URL", "https://modwerkstatt.com/tpfmm")
+REQUEST_TIMEOUT = 30  # Sekunden, damit ein hängender Server den Worker nicht ewig blockiert
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_BATCH_SIZE = 1000  # Katalogeinträge je Teillieferung an on_entries
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_VALUE_ENDS = frozenset(",:]} \t\n\r")
+
+
+class _ChunkBuffer:
+    # Textpuffer über eintreffende Bytes; verarbeitete Teile werden beim Nachladen verworfen
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            piece = self._decoder.decode(chunk)
+            if piece:
+                self.text = self.text[self.pos:] + piece
+                self.pos = 0
+                return True
+        self.eof = True
+        piece = self._decoder.decode(b"", final=True)
+        self.text = self.text[self.pos:] + piece
+        self.pos = 0
+        return bool(piece)
+
+    def peek(self):
+        # Nächstes Zeichen nach Leerraum, "" am Ende
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def skip(self, char):
+        if self.peek() != char:
+            return False
+        self.pos += 1
+        return True
+
+    def expect(self, char):
+        if not self.skip(char):
+            raise ValueError(f"Ungültiger Katalog: '{char}' erwartet")
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue  # Wert noch nicht vollständig angekommen
+                raise
+            if (not isinstance(value, (dict, list, str)) and self.text[end:end + 1] not in _VALUE_ENDS
+                    and self.fill()):
+                continue  # Zahl oder Literal könnte am Pufferende abgeschnitten sein
+            self.pos = end
+            return value
+
+
+def iter_catalog_entries(chunks, key="mods"):
+    # Liefert die Einträge des mods-Arrays, während die Bytes noch eintreffen –
+    # weder der Rohtext noch der komplette Objektbaum liegen dabei auf einmal im Speicher
+    buffer = _ChunkBuffer(chunks)
+    buffer.expect("{")
+    if buffer.skip("}"):
+        raise KeyError(key)
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name == key:
+            break
+        buffer.value()  # anderes Feld überspringen
+        if not buffer.skip(","):
+            buffer.expect("}")
+            raise KeyError(key)
+
+    buffer.expect("[")
+    if buffer.skip("]"):
+        return
+    while True:
+        yield buffer.value()
+        if not buffer.skip(","):
+            buffer.expect("]")
+            return
+
+
+def _batched(entries, size):
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CatalogCache:
+    # Hält die letzte /tpfmm-Antwort samt ETag/Last-Modified auf der Platte und fragt nur bedingt neu an
+    def __init__(self, url=CATALOG_URL, cache_dir=None):
+        self.url = url
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.body_path = os.path.join(self.cache_dir, "catalog.json")
+        self.meta_path = os.path.join(self.cache_dir, "catalog_meta.json")
+        self._lock = threading.Lock()
+        self._mods = None
+        self._meta = {}
+
+    def load_cached(self):
+        with self._lock:
+            return self._load_cached_locked()
+
+    def _load_cached_locked(self):
+        # Einmal pro Prozess von der Platte parsen, danach aus dem Speicher liefern
+        if self._mods is not None:
+            return self._mods
+
+        with span("load_cached_catalog"):
+            return self._read_cache_files()
+
+    def _read_cache_files(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("url") != self.url:
+                return None
+            with open(self.body_path, "rb") as file:
+                mods = list(iter_catalog_entries(iter(lambda: file.read(STREAM_CHUNK_SIZE), b"")))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        self._mods = mods
+        self._meta = meta
+        return mods
+
+    def fetch(self, on_entries=None, batch_size=STREAM_BATCH_SIZE):
+        # on_entries(batch) wird während des Downloads mit neuen Katalogeinträgen aufgerufen
+        headers = {}
+        with self._lock:
+            cached_mods = self._load_cached_locked()
+            if cached_mods is not None:
+                if self._meta.get("etag"):
+                    headers["If-None-Match"] = self._meta["etag"]
+                if self._meta.get("last_modified"):
+                    headers["If-Modified-Since"] = self._meta["last_modified"]
+
+        # requests erst hier laden, das spart beim Programmstart spürbar Zeit
+        import requests
+
+        # Netzwerk und Parsen laufen verschränkt, daher misst fetch_catalog beides
+        with span("fetch_catalog", url=self.url) as fetch_span, \
+                requests.get(self.url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            fetch_span.set(status=response.status_code)
+
+            if response.status_code == 304 and cached_mods is not None:
+                # Nichts geändert – gespeicherten Parse wiederverwenden
+                return cached_mods
+
+            response.raise_for_status()
+            mods, body_temp_path = self._stream_to_cache(response, fetch_span, on_entries, batch_size)
+
+        meta = {
+            "url": self.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        with self._lock:
+            self._store(body_temp_path, meta)
+            self._mods = mods
+            self._meta = meta
+
+        return mods
+
+    def _stream_to_cache(self, response, fetch_span, on_entries, batch_size):
+        # Rohdaten gehen direkt in eine Cache-Datei, geparst wird dabei Eintrag für Eintrag
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix="catalog-", suffix=".tmp", dir=self.cache_dir)
+            body_file = os.fdopen(fd, "wb")
+        except OSError as e:
+            print(f"⚠️ Katalog-Cache konnte nicht geschrieben werden: {e}")
+            body_file = None
+
+        def chunks():
+            nonlocal body_file
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                if body_file is not None:
+                    try:
+                        body_file.write(chunk)
+                    except OSError as e:
+                        # Ohne Cache-Datei weitermachen, die Anzeige ist wichtiger
+                        print(f"⚠️ Katalog-Cache konnte nicht geschrieben werden: {e}")
+                        body_file.close()
+                        _remove_quietly(temp_path)
+                        body_file = None
+                fetch_span.add("bytes", len(chunk))
+                yield chunk
+
+        mods = []
+        try:
+            for batch in _batched(iter_catalog_entries(chunks()), batch_size):
+                mods.extend(batch)
+                if on_entries is not None:
+                    on_entries(batch)
+            fetch_span.set(entries=len(mods))
+        except BaseException:
+            if body_file is not None:
+                body_file.close()
+                _remove_quietly(temp_path)
+            raise
+
+        if body_file is None:
+            return mods, None
+        try:
+            body_file.close()
+        except OSError as e:
+            print(f"⚠️ Katalog-Cache konnte nicht geschrieben werden: {e}")
+            _remove_quietly(temp_path)
+            return mods, None
+        return mods, temp_path
+
+    def _store(self, body_temp_path, meta):
+        # Erst Inhalt, dann Metadaten – jeweils atomar per os.replace
+        if body_temp_path is None:
+            return
+        try:
+            os.replace(body_temp_path, self.body_path)
+            _write_atomic(self.meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            print(f"⚠️ Katalog-Cache konnte nicht geschrieben werden: {e}")
+            _remove_quietly(body_temp_path)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _write_atomic(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
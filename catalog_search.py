@@ -0,0 +1,92 @@
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from update_check import catalog_folder_name
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+AUTHOR_KEYS = ("author", "authors", "username")
+PREFIX_CACHE_SIZE = 256
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+def catalog_author(entry):
+    # Der Katalog kennt je nach Herkunft "author", "authors" (Liste) oder "username"
+    for key in AUTHOR_KEYS:
+        value = entry.get(key)
+        if not value:
+            continue
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list):
+            names = [author.get("name", "") if isinstance(author, dict) else str(author) for author in value]
+            return ", ".join(name for name in names if name)
+        return str(value)
+    return ""
+
+
+class CatalogSearchIndex:
+    # Token-Index über Name, Autor und Ordnername des kompletten Katalogs.
+    # Einträge liegen nach Name sortiert vor, Treffer sind Positionen darin – sortierte Treffer sind damit
+    # automatisch alphabetisch. Präfixe werden per bisect über die sortierte Tokenliste aufgelöst.
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: (entry.get("name") or "").casefold())
+
+        postings = {}
+        for position, entry in enumerate(self.entries):
+            text = " ".join((entry.get("name") or "", catalog_author(entry), catalog_folder_name(entry) or ""))
+            for token in set(tokenize(text)):
+                postings.setdefault(token, []).append(position)
+
+        self._tokens = sorted(postings)
+        self._postings = [postings[token] for token in self._tokens]
+        self._all = range(len(self.entries))
+        self._prefix_cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query):
+        # Alle Suchbegriffe müssen (als Wortanfang) vorkommen; liefert sortierte Positionen
+        terms = set(tokenize(query))
+        if not terms:
+            return self._all
+
+        matches = [self._matches_for_prefix(term) for term in terms]
+        # Begriffe, die auf alles passen, schränken nichts ein; mit der kleinsten Treffermenge beginnen
+        matches = sorted((found for found in matches if len(found) < len(self.entries)), key=len)
+        if not matches:
+            return self._all
+        if len(matches) == 1:
+            found = matches[0]
+            return found if isinstance(found, list) else sorted(found)
+
+        result = set(matches[0])
+        for found in matches[1:]:
+            result.intersection_update(found)
+            if not result:
+                return []
+        return sorted(result)
+
+    def _matches_for_prefix(self, prefix):
+        # Beim Tippen kommen dieselben Präfixe immer wieder, daher ein kleiner LRU-Cache
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            self._prefix_cache.move_to_end(prefix)
+            return cached
+
+        first = bisect_left(self._tokens, prefix)
+        last = bisect_left(self._tokens, prefix + "\U0010ffff", first)
+        if last - first == 1:
+            matches = self._postings[first]
+        else:
+            matches = set()
+            for postings in self._postings[first:last]:
+                matches.update(postings)
+
+        self._prefix_cache[prefix] = matches
+        if len(self._prefix_cache) > PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return matches
@@ -0,0 +1,170 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from catalog import CatalogCache
+from get_local_mods import get_mods_versions
+from mod_updater import BulkUpdater, configure_archive_cache
+from update_check import diff_mods, ModRecord
+
+# Kopfloser Einstieg für Cronjobs und Server: kein QApplication, kein Display nötig.
+#   python cli.py check --mods-folder /pfad/a --mods-folder /pfad/b
+#   python cli.py update --all --json
+EXIT_OK = 0
+EXIT_UPDATES_AVAILABLE = 1
+EXIT_ERROR = 2
+
+
+def resolve_mods_folders(args):
+    if args.mods_folder:
+        return args.mods_folder
+    if os.environ.get("MODLOADER_MODS_FOLDER"):
+        return os.environ["MODLOADER_MODS_FOLDER"].split(os.pathsep)
+
+    # Rückfall auf die GUI-Einstellung (benötigt nur QtCore, kein Display)
+    from get_local_mods import get_mod_folder_from_settings
+    mod_folder = get_mod_folder_from_settings()
+    return [mod_folder] if mod_folder else []
+
+
+def check_folder(mods_folder, mods_json):
+    mods_local = get_mods_versions(mods_folder)
+    return mods_folder, [ModRecord.from_status(status) for status in diff_mods(mods_json, mods_local)]
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"muss mindestens 1 sein: {value}")
+    return number
+
+
+def record_to_dict(record):
+    return {
+        "name": record.name or "N/A",
+        "folder": record.folder_name,
+        "local_version": record.local_version,
+        "remote_version": record.remote_version,
+        "needs_update": record.needs_update,
+        "zip_filename": record.zip_filename,
+    }
+
+
+def run(args):
+    if args.archive_cache_mb is not None:
+        configure_archive_cache(args.archive_cache_mb)
+
+    mods_folders = resolve_mods_folders(args)
+    if not mods_folders:
+        print("Kein Mod-Ordner angegeben (--mods-folder oder MODLOADER_MODS_FOLDER).", file=sys.stderr)
+        return EXIT_ERROR, None
+    missing = [mods_folder for mods_folder in mods_folders if not os.path.isdir(mods_folder)]
+    if missing:
+        # Sonst meldete ein Tippfehler nur "0 installiert" und der Cronjob liefe erfolgreich durch
+        print(f"Mod-Ordner existiert nicht: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_ERROR, None
+
+    # Katalog nur einmal holen, dann alle Installationen parallel dagegen prüfen
+    mods_json = CatalogCache().fetch()
+    with ThreadPoolExecutor(max_workers=min(len(mods_folders), args.jobs)) as executor:
+        checked = list(executor.map(lambda folder: check_folder(folder, mods_json), mods_folders))
+
+    report = {"folders": []}
+    for mods_folder, records in checked:
+        report["folders"].append({
+            "mods_folder": mods_folder,
+            "mods": [record_to_dict(record) for record in records],
+        })
+
+    if args.command == "check":
+        outdated_count = sum(1 for folder in report["folders"] for mod in folder["mods"] if mod["needs_update"])
+        return (EXIT_UPDATES_AVAILABLE if outdated_count else EXIT_OK), report
+
+    # Gleiche Archive nur einmal laden und in alle betroffenen Ordner installieren
+    wanted = set(args.mods)
+    targets = {}
+    versions = {}
+    for mods_folder, records in checked:
+        for record in records:
+            if not record.needs_update:
+                continue
+            if not args.all and record.folder_base not in wanted and record.folder_name not in wanted:
+                continue
+            targets.setdefault(record.zip_filename, []).append(mods_folder)
+            versions[record.zip_filename] = record.remote_version
+
+    jobs = [(zip_filename, zip_filename.replace('.zip', ''), versions[zip_filename]) for zip_filename in targets]
+    updater = BulkUpdater(None, max_downloads=args.jobs)
+    if jobs:
+        updater.run(jobs, targets)
+
+    # Ergebnis je Ordner: ein Fehler in einer Installation betrifft die anderen nicht
+    for folder_report in report["folders"]:
+        for mod in folder_report["mods"]:
+            if folder_report["mods_folder"] in targets.get(mod["zip_filename"], []):
+                mod["updated"] = updater.folder_results.get((mod["zip_filename"], folder_report["mods_folder"]), False)
+
+    failed = sum(1 for folder in report["folders"] for mod in folder["mods"] if mod.get("updated") is False)
+    return (EXIT_ERROR if failed else EXIT_OK), report
+
+
+def print_report(report):
+    for folder_report in report["folders"]:
+        print(f"📁 {folder_report['mods_folder']}")
+        for mod in folder_report["mods"]:
+            if "updated" in mod:
+                marker = "✅" if mod["updated"] else "❌"
+                print(f"  {marker} {mod['name']}: {mod['local_version']} ➡️ {mod['remote_version']}")
+            elif mod["needs_update"]:
+                print(f"  ⬆️ {mod['name']}: {mod['local_version']} ➡️ {mod['remote_version']}")
+        outdated_count = sum(1 for mod in folder_report["mods"] if mod["needs_update"])
+        print(f"  {len(folder_report['mods'])} installiert, {outdated_count} mit Update")
+
+
+def build_parser():
+    # Gemeinsame Optionen stehen hinter dem Befehl, wie in den Beispielen oben
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--mods-folder", action="append",
+                        help="Mod-Ordner (mehrfach angebbar, Standard: Einstellung der GUI)")
+    common.add_argument("--json", action="store_true", help="Ergebnis als JSON auf stdout ausgeben")
+    common.add_argument("--jobs", type=positive_int, default=4, help="parallele Ordner-Scans bzw. Downloads")
+    common.add_argument("--archive-cache-mb", type=int, help="Größengrenze des Archiv-Caches in MB (0 = aus)")
+
+    parser = argparse.ArgumentParser(description="ModWerkstatt Mod Loader ohne Oberfläche")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("check", parents=[common], help="Verfügbare Updates anzeigen")
+    update_parser = subparsers.add_parser("update", parents=[common], help="Mods aktualisieren")
+    update_parser.add_argument("--all", action="store_true", help="Alle veralteten Mods aktualisieren")
+    update_parser.add_argument("mods", nargs="*", help="Ordnernamen der zu aktualisierenden Mods")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "update" and not args.all and not args.mods:
+        parser.error("update benötigt --all oder mindestens einen Mod-Ordnernamen")
+
+    # Bei --json gehören Fortschrittsmeldungen nach stderr, stdout bleibt reines JSON
+    output = sys.stderr if args.json else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            exit_code, report = run(args)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"Fehler beim Laden der Daten: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if report is not None:
+        if args.json:
+            json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            print_report(report)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
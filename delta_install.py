@@ -0,0 +1,260 @@
+import hashlib
+import io
+import json
+import os
+import posixpath
+import shutil
+import tempfile
+import zipfile
+import requests
+from app_paths import get_cache_dir
+from downloader import DownloadCancelled
+
+REQUEST_TIMEOUT = 30
+BLOCK_SIZE = 64 * 1024  # Mindestgröße je Range-Anfrage (Central Directory, Header)
+MAX_PREFETCH = 8 * 1024 * 1024  # größere Einträge werden blockweise geladen, Speicher bleibt begrenzt
+LOCAL_HEADER_SLACK = 30 + 1024  # fester Local-File-Header plus großzügig Platz für Name und Extra-Feld
+
+
+class RangeNotSupported(Exception):
+    pass
+
+
+class HttpRangeReader(io.RawIOBase):
+    # Datei-Objekt über HTTP-Range-Anfragen; zipfile liest damit nur Central Directory und benötigte Einträge
+    def __init__(self, url, session=None):
+        super().__init__()
+        self.url = url
+        self.http = session or requests
+        self.bytes_fetched = 0
+        self.requests_made = 0
+        self._pos = 0
+        self._cache_start = 0
+        self._cache = b""
+        self._read_ahead = BLOCK_SIZE
+
+        response = self.http.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes" or "Content-Length" not in response.headers:
+            raise RangeNotSupported(url)
+        self.size = int(response.headers["Content-Length"])
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        self._pos = max(0, min(self._pos, self.size))
+        return self._pos
+
+    def prefetch(self, start, length):
+        # Einen ganzen Eintrag mit einer einzigen Anfrage holen; Folgeanfragen in derselben Blockgröße
+        self._read_ahead = max(BLOCK_SIZE, min(length, MAX_PREFETCH))
+        self._fill(start, self._read_ahead)
+
+    def readinto(self, buffer):
+        wanted = min(len(buffer), self.size - self._pos)
+        if wanted <= 0:
+            return 0
+
+        cache_end = self._cache_start + len(self._cache)
+        if not (self._cache_start <= self._pos and self._pos + wanted <= cache_end):
+            self._fill(self._pos, max(wanted, self._read_ahead))
+
+        offset = self._pos - self._cache_start
+        buffer[:wanted] = self._cache[offset:offset + wanted]
+        self._pos += wanted
+        return wanted
+
+    def _fill(self, start, length):
+        end = min(start + length, self.size) - 1
+        response = self.http.get(self.url, headers={"Range": f"bytes={start}-{end}"}, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 206:
+            raise RangeNotSupported(self.url)
+        self._cache_start = start
+        self._cache = response.content
+        self.bytes_fetched += len(self._cache)
+        self.requests_made += 1
+
+
+def _manifest_path(mods_folder, mod_dir):
+    key = hashlib.sha1(os.path.abspath(mods_folder).encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir("manifests", key), f"{mod_dir}.json")
+
+
+def load_manifest(mods_folder, mod_dir):
+    try:
+        with open(_manifest_path(mods_folder, mod_dir), "r", encoding="utf-8") as file:
+            return json.load(file)["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_manifest(mods_folder, mod_dir, files):
+    path = _manifest_path(mods_folder, mod_dir)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"files": files}, file)
+    os.replace(temp_path, path)
+
+
+def discard_manifest(mods_folder, mod_dir):
+    try:
+        os.remove(_manifest_path(mods_folder, mod_dir))
+    except OSError:
+        pass
+
+
+def archive_entries(zip_file):
+    # Relative Pfade im Mod-Ordner -> ZipInfo; ein einzelner Oberordner wird wie beim Entpacken abgeschnitten
+    infos = [info for info in zip_file.infolist() if not info.is_dir()]
+    top_level = {info.filename.split("/", 1)[0] for info in zip_file.infolist()}
+    prefix = ""
+    if len(top_level) == 1 and any("/" in info.filename for info in infos):
+        prefix = f"{top_level.pop()}/"
+
+    entries = {}
+    for info in infos:
+        relative_path = _safe_relative_path(info.filename[len(prefix):] if prefix else info.filename)
+        if relative_path:
+            entries[relative_path] = info
+    return entries
+
+
+def _safe_relative_path(name):
+    normalized = posixpath.normpath(name.replace("\\", "/"))
+    if normalized.startswith(("../", "/")) or normalized in ("..", ".") or ":" in normalized.split("/", 1)[0]:
+        return None
+    return normalized
+
+
+def write_manifest_for_archive(zip_filepath, mods_folder, mod_dir):
+    # Nach einer vollständigen Installation: Stand aus dem Archiv plus mtime der geschriebenen Dateien festhalten
+    with zipfile.ZipFile(zip_filepath) as zip_file:
+        entries = archive_entries(zip_file)
+    write_manifest_for_entries(mods_folder, mod_dir, entries)
+
+
+def write_manifest_for_entries(mods_folder, mod_dir, entries):
+    mod_folder_path = os.path.join(mods_folder, mod_dir)
+    save_manifest(mods_folder, mod_dir, _manifest_files(mod_folder_path, entries))
+
+
+def _manifest_files(mod_folder_path, entries):
+    files = {}
+    for relative_path, info in entries.items():
+        try:
+            stat = os.stat(os.path.join(mod_folder_path, *relative_path.split("/")))
+        except OSError:
+            continue
+        files[relative_path] = {"size": info.file_size, "crc": info.CRC, "mtime_ns": stat.st_mtime_ns}
+    return files
+
+
+def _unchanged_on_disk(target_path, info, manifest_entry):
+    # CRC kommt aus dem Manifest; Größe und mtime zeigen, ob jemand die Datei seither angefasst hat
+    if not manifest_entry or manifest_entry["size"] != info.file_size or manifest_entry["crc"] != info.CRC:
+        return False
+    try:
+        stat = os.stat(target_path)
+    except OSError:
+        return False
+    return stat.st_size == manifest_entry["size"] and stat.st_mtime_ns == manifest_entry["mtime_ns"]
+
+
+def apply_delta(zip_file, mod_folder_path, manifest, reader=None, cancel_event=None):
+    # Arbeitet auf einer Staging-Kopie (siehe stage_delta), nie auf dem installierten Ordner.
+    # Dateien werden ausschließlich per os.replace ersetzt – hart verlinkte Originale bleiben so unverändert.
+    entries = archive_entries(zip_file)
+    stats = {"written": 0, "removed": 0, "unchanged": 0, "bytes_written": 0}
+
+    # mod.lua zuletzt: daran erkennt der Scanner die Version
+    for relative_path, info in sorted(entries.items(), key=lambda item: item[0] == "mod.lua"):
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled(os.path.basename(mod_folder_path))
+
+        target_path = os.path.join(mod_folder_path, *relative_path.split("/"))
+        if _unchanged_on_disk(target_path, info, manifest.get(relative_path)):
+            stats["unchanged"] += 1
+            continue
+
+        if reader is not None:
+            reader.prefetch(info.header_offset, info.compress_size + len(info.filename) + LOCAL_HEADER_SLACK)
+
+        # Erst in eine Nachbardatei schreiben, dann atomar ersetzen
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(prefix=".modloader-", dir=os.path.dirname(target_path))
+        try:
+            with os.fdopen(file_descriptor, "wb") as target, zip_file.open(info) as source:
+                shutil.copyfileobj(source, target, 256 * 1024)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        stats["written"] += 1
+        stats["bytes_written"] += info.file_size
+
+    # Dateien der alten Version, die es im neuen Archiv nicht mehr gibt
+    for relative_path in set(manifest) - set(entries):
+        stale_path = os.path.join(mod_folder_path, *relative_path.split("/"))
+        try:
+            os.remove(stale_path)
+            stats["removed"] += 1
+        except OSError:
+            continue
+        _remove_empty_parents(os.path.dirname(stale_path), mod_folder_path)
+
+    return entries, stats
+
+
+def _remove_empty_parents(directory, stop_at):
+    while os.path.normpath(directory) != os.path.normpath(stop_at):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
+
+
+def _link_or_copy(source, target):
+    # Harte Links kosten keinen Platz und erhalten die mtime; über Dateisystemgrenzen hinweg kopieren
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def stage_delta(url, mods_folder, mod_dir, staging_dir, session=None, cancel_event=None):
+    # Baut den neuen Stand als Kopie des installierten Ordners in staging_dir auf; der installierte Ordner
+    # bleibt unangetastet, bis der Aufrufer die Kopie als Ganzes austauscht.
+    # Liefert None, wenn kein Delta möglich ist (kein Manifest, Server ohne Range-Unterstützung),
+    # sonst (Pfad der Kopie, Archiv-Einträge für das Manifest, Statistik).
+    mod_folder_path = os.path.join(mods_folder, mod_dir)
+    manifest = load_manifest(mods_folder, mod_dir)
+    if manifest is None or not os.path.isdir(mod_folder_path):
+        return None
+
+    try:
+        reader = HttpRangeReader(url, session)
+    except RangeNotSupported:
+        return None
+
+    staged_path = os.path.join(staging_dir, "delta_mod")
+    with zipfile.ZipFile(reader) as zip_file:
+        shutil.copytree(mod_folder_path, staged_path, symlinks=True, copy_function=_link_or_copy)
+        entries, stats = apply_delta(zip_file, staged_path, manifest, reader, cancel_event)
+
+    stats["bytes_downloaded"] = reader.bytes_fetched
+    stats["archive_size"] = reader.size
+    return staged_path, entries, stats
@@ -0,0 +1,109 @@
+import json
+import os
+import requests
+from tracing import span
+
+CHUNK_SIZE = 256 * 1024  # begrenzter Puffer – Speicherbedarf unabhängig von der Archivgröße
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def download_file(url, target_path, progress_callback=None, cancel_event=None, session=None):
+    # Lädt in "<ziel>.part" und setzt abgebrochene Übertragungen per HTTP-Range fort
+    http = session or requests
+    part_path = f"{target_path}.part"
+    validator_path = f"{part_path}.json"
+
+    last_error = None
+    for _ in range(MAX_RETRIES):
+        try:
+            _download_attempt(http, url, part_path, validator_path, progress_callback, cancel_event)
+            os.replace(part_path, target_path)
+            _remove_quietly(validator_path)
+            return target_path
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            # Teil-Datei bleibt liegen, der nächste Versuch setzt dort fort
+            last_error = e
+            print(f"⚠️ Download unterbrochen, versuche Fortsetzung: {e}")
+
+    raise last_error
+
+
+def _download_attempt(http, url, part_path, validator_path, progress_callback, cancel_event):
+    headers = {}
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    validator = _read_validator(validator_path) if offset else None
+
+    if offset and validator:
+        # If-Range: hat sich die Datei auf dem Server geändert, kommt sie komplett (200) statt als Rest (206)
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    else:
+        offset = 0
+
+    with http.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code == 416:
+            # Range passt nicht mehr (z.B. Datei auf dem Server kleiner) – beim nächsten Versuch von vorne
+            _remove_quietly(part_path)
+            _remove_quietly(validator_path)
+            raise requests.ConnectionError("Ungültiger Range-Bereich, starte Download neu")
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            mode = "ab"
+        else:
+            mode = "wb"
+            offset = 0
+            _write_validator(validator_path, response.headers)
+
+        content_length = response.headers.get("Content-Length")
+        total = offset + int(content_length) if content_length else None
+        downloaded = offset
+
+        if progress_callback:
+            progress_callback(downloaded, total)
+
+        with span("download", url=url, resumed_at=offset) as download_span, open(part_path, mode) as file:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled(url)
+                if not chunk:
+                    continue
+                file.write(chunk)
+                downloaded += len(chunk)
+                download_span.add("bytes", len(chunk))
+                if progress_callback:
+                    progress_callback(downloaded, total)
+
+    if total is not None and downloaded < total:
+        raise requests.ConnectionError(f"Verbindung nach {downloaded} von {total} Bytes beendet")
+
+
+def _read_validator(validator_path):
+    try:
+        with open(validator_path, "r", encoding="utf-8") as file:
+            return json.load(file).get("validator")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_validator(validator_path, response_headers):
+    # Nur starke Validatoren taugen für If-Range
+    etag = response_headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else response_headers.get("Last-Modified")
+    if validator:
+        with open(validator_path, "w", encoding="utf-8") as file:
+            json.dump({"validator": validator}, file)
+    else:
+        _remove_quietly(validator_path)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
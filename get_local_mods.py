@@ -1,46 +1,203 @@
 import re
 import os
-from PyQt5.QtCore import QSettings
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app_paths import get_cache_dir
+from tracing import span, traced
 
 
 def get_mod_folder_from_settings():
+    # Erst hier importieren, damit der Scanner auch ohne Qt (z.B. im CLI) nutzbar bleibt
+    from PyQt5.QtCore import QSettings
     settings = QSettings("MeinProgramm", "ModLoader")
     return settings.value("mod_folder_path", "")
 
 
+MINOR_VERSION_PATTERN = re.compile(r'minorVersion\s*=\s*(\d+)', re.IGNORECASE)
+MAJOR_VERSION_PATTERN = re.compile(r'(\d+)$')
+INDEX_FORMAT_VERSION = 1
+PARSE_WORKERS = 8
+
+
+# Platzhalter für "Lesen fehlgeschlagen" – im Gegensatz zu None ("keine minorVersion in der Datei")
+READ_FAILED = object()
+
+
 def read_minor_version(mod_lua_path):
-    minor_version_pattern = re.compile(r'minorVersion\s*=\s*(\d+)', re.IGNORECASE)
-    with open(mod_lua_path, "r", encoding="utf-8") as file:
-        for line in file:
-            minor_match = minor_version_pattern.search(line)
-            if minor_match:
-                return int(minor_match.group(1))
+    minor_version = _read_minor_version(mod_lua_path)
+    return None if minor_version is READ_FAILED else minor_version
+
+
+def _read_minor_version(mod_lua_path):
+    try:
+        with open(mod_lua_path, "r", encoding="utf-8") as file:
+            for line in file:
+                minor_match = MINOR_VERSION_PATTERN.search(line)
+                if minor_match:
+                    # Rest der Datei interessiert nicht mehr
+                    return int(minor_match.group(1))
+    except (OSError, UnicodeDecodeError) as e:
+        # z.B. vom Spiel gesperrt oder gerade im Schreiben
+        print(f"⚠️ {mod_lua_path} konnte nicht gelesen werden: {e}")
+        return READ_FAILED
     return None
 
 
-def get_mods_versions(mods_folder):
-    mods_version_list = []
+class LocalModIndex:
+    # Persistierter Index der lokalen Mods: Ordnername -> mtime/Größe der mod.lua und gelesene minorVersion.
+    # Nur geänderte mod.lua-Dateien werden neu geparst.
+    def __init__(self, mods_folder, persist=True):
+        self.mods_folder = mods_folder
+        self.persist = persist
+        self.index_path = _index_path(mods_folder) if persist else None
+        self.entries = self._load() if persist else {}
 
-    if not os.path.exists(mods_folder):
-        print("Mods-Ordner existiert nicht!")
-        return mods_version_list
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("format") != INDEX_FORMAT_VERSION:
+                return {}
+            return data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            return {}
+
+    def save(self):
+        if not self.persist:
+            return
+        temp_path = f"{self.index_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"format": INDEX_FORMAT_VERSION, "entries": self.entries}, file)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Mod-Index konnte nicht gespeichert werden: {e}")
+
+    def refresh(self):
+        # Ein Verzeichnislisting plus ein stat() je mod.lua; geparst wird nur, was sich geändert hat
+        entries = {}
+        to_parse = []
+
+        with os.scandir(self.mods_folder) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.is_dir():
+                    continue
+                stat = _stat_mod_lua(dir_entry.path)
+                if stat is None:
+                    continue
+
+                cached = self.entries.get(dir_entry.name)
+                if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                    entries[dir_entry.name] = cached
+                else:
+                    entries[dir_entry.name] = None
+                    to_parse.append((dir_entry.name, stat))
+
+        self._parse(to_parse, entries)
+
+        changed = bool(to_parse) or entries.keys() != self.entries.keys()
+        self.entries = entries
+        if changed:
+            self.save()
+
+        return self.versions()
+
+    def refresh_entries(self, mod_dirs):
+        # Nur die angegebenen Ordner neu prüfen; liefert die Namen, deren Eintrag sich geändert hat
+        changed = []
+        to_parse = []
 
-    for mod_dir in os.listdir(mods_folder):
-        mod_path = os.path.join(mods_folder, mod_dir)
-        mod_lua_path = os.path.join(mod_path, 'mod.lua')
+        for mod_dir in mod_dirs:
+            stat = _stat_mod_lua(os.path.join(self.mods_folder, mod_dir))
+            cached = self.entries.get(mod_dir)
+            if stat is None:
+                if cached is not None:
+                    del self.entries[mod_dir]
+                    changed.append(mod_dir)
+            elif not cached or cached["mtime_ns"] != stat.st_mtime_ns or cached["size"] != stat.st_size:
+                to_parse.append((mod_dir, stat))
 
-        if os.path.isdir(mod_path) and os.path.exists(mod_lua_path):
-            major_version_match = re.search(r'(\d+)$', mod_dir)
-            major_version = int(major_version_match.group(1)) if major_version_match else None
+        before = {mod_dir: self.entries.get(mod_dir) for mod_dir, _ in to_parse}
+        self._parse(to_parse, self.entries)
+        changed.extend(mod_dir for mod_dir, _ in to_parse
+                       if _version_of(mod_dir, before[mod_dir]) != _version_of(mod_dir, self.entries[mod_dir]))
 
-            minor_version = read_minor_version(mod_lua_path)
+        if to_parse or changed:
+            self.save()
+        return changed
 
-            if major_version is not None and minor_version is not None:
-                full_version = f"{major_version}.{minor_version}"
+    def version_of(self, mod_dir):
+        return _version_of(mod_dir, self.entries.get(mod_dir))
+
+    def versions(self):
+        mods_version_list = []
+        for mod_dir, entry in self.entries.items():
+            full_version = _version_of(mod_dir, entry)
+            if full_version is not None:
                 mods_version_list.append({
                     "modOrdner": mod_dir,
                     "version": full_version
                 })
+        return mods_version_list
+
+    @traced("parse_mod_lua")
+    def _parse(self, to_parse, entries):
+        if not to_parse:
+            return
+
+        paths = [os.path.join(self.mods_folder, mod_dir, 'mod.lua') for mod_dir, _ in to_parse]
+        with ThreadPoolExecutor(max_workers=min(PARSE_WORKERS, len(paths))) as executor:
+            minor_versions = list(executor.map(_read_minor_version, paths))
+
+        for (mod_dir, stat), minor_version in zip(to_parse, minor_versions):
+            if minor_version is READ_FAILED:
+                # Nicht als gelesen merken: ohne passende mtime wird beim nächsten Auffrischen erneut geparst.
+                # Bis dahin gilt die zuletzt bekannte Version weiter.
+                previous = self.entries.get(mod_dir)
+                entries[mod_dir] = {
+                    "mtime_ns": None,
+                    "size": None,
+                    "minor": previous["minor"] if previous else None,
+                }
+                continue
+            entries[mod_dir] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "minor": minor_version,
+            }
+
+
+def _index_path(mods_folder):
+    key = hashlib.sha1(os.path.abspath(mods_folder).encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir("local_index"), f"{key}.json")
+
+
+def _stat_mod_lua(mod_path):
+    try:
+        return os.stat(os.path.join(mod_path, 'mod.lua'))
+    except OSError:
+        return None  # kein Mod-Ordner
+
+
+def _version_of(mod_dir, entry):
+    if not entry or entry["minor"] is None:
+        return None
+    major_version_match = MAJOR_VERSION_PATTERN.search(mod_dir)
+    if not major_version_match:
+        return None
+    return f"{int(major_version_match.group(1))}.{entry['minor']}"
+
+
+def get_mods_versions(mods_folder):
+    if not os.path.exists(mods_folder):
+        print("Mods-Ordner existiert nicht!")
+        return []
+
+    with span("get_mods_versions") as scan_span:
+        mods_version_list = LocalModIndex(mods_folder).refresh()
+        scan_span.set(mods=len(mods_version_list))
     return mods_version_list
 
 
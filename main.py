@@ -1,20 +1,49 @@
+import time
+_PROCESS_START = time.perf_counter()  # Bezugspunkt für die Zeit bis zum ersten Bild
+
 import sys
-import re
-import requests
-import webbrowser
-import shutil
 import os
-import tempfile
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel, QTableWidget,
-                             QTableWidgetItem, QMessageBox, QFileDialog, QAction, QLabel)
-from PyQt5.QtCore import Qt, QSettings, QTimer
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel, QTableView,
+                             QHeaderView, QAbstractItemView, QMessageBox, QFileDialog, QAction, QLabel, QTabWidget,
+                             QLineEdit)
+from PyQt5.QtCore import Qt, QSettings, QTimer, QThreadPool
 from PyQt5 import QtWidgets, QtGui
 from datetime import datetime
-from packaging.version import parse as parse_version
 from toast_notification import ToastNotification
 from get_local_mods import get_mods_versions, get_mod_folder_from_settings
+from workers import (RefreshWorker, UpdateWorker, BulkUpdateWorker, AppUpdateCheckWorker, CatalogIndexWorker,
+                     PrefetchWorker)
+from catalog import CatalogCache
+from archive_cache import DEFAULT_MAX_MB
+import tracing
+from tracing import traced
+from mod_watcher import ModFolderWatcher
+from update_check import (diff_mods, build_local_index, split_foldername_version, ModRecord, catalog_folder_base,
+                          catalog_zip_filename)
+from mod_table_model import ModTableModel, CatalogTableModel, ActionButtonDelegate, ACTION_COLUMN
 
 APP_VERSION = "0.0.1"
+GITHUB_TIMEOUT = 10
+
+# Zielwert für die Zeit vom Programmstart bis zum ersten gezeichneten Fenster
+FIRST_PAINT_TARGET_MS = 500
+AUTO_REFRESH_MINUTES = 15
+
+# Vorladen ausstehender Updates: Bandbreite in KB/s
+PREFETCH_DEFAULT_KBPS = 1024
+
+INSTALLED_TAB_TITLE = "Installiert"
+INCOMPLETE_TAB_TITLE = "Installiert (unvollständig)"
+
+# Phasen für die Statusleisten-Zusammenfassung eines Ladevorgangs
+REFRESH_PHASES = [
+    ("load_cached_catalog", "Cache"),
+    ("fetch_catalog", "Netz+JSON"),
+    ("get_mods_versions", "Scan"),
+    ("get_combined_mod_list", "Abgleich"),
+    ("populate_mod_table", "Tabelle"),
+    ("update_mod_table", "Tabellen-Diff"),
+]
 
 class ModViewer(QMainWindow):
     def __init__(self):
@@ -36,6 +65,50 @@ class ModViewer(QMainWindow):
         menu = self.menuBar().addMenu("Einstellungen")
         menu.addAction(select_mod_folder_action)
 
+        # Mod-Ordner live überwachen (Installationen von außen sofort anzeigen)
+        self.watch_folder_action = QAction("Mod-Ordner überwachen", self, checkable=True)
+        self.watch_folder_action.setChecked(
+            QSettings("MeinProgramm", "ModLoader").value("watch_mod_folder", True, type=bool))
+        self.watch_folder_action.toggled.connect(self.toggle_mod_watcher)
+        menu.addAction(self.watch_folder_action)
+
+        # Katalog regelmäßig im Hintergrund abgleichen; ohne Änderungen kostet das fast nichts
+        self.auto_refresh_action = QAction(f"Automatisch auffrischen (alle {AUTO_REFRESH_MINUTES} Minuten)", self,
+                                           checkable=True)
+        self.auto_refresh_action.setChecked(
+            QSettings("MeinProgramm", "ModLoader").value("auto_refresh", False, type=bool))
+        self.auto_refresh_action.toggled.connect(self.toggle_auto_refresh)
+        menu.addAction(self.auto_refresh_action)
+        self.auto_refresh_timer = QTimer(self)
+        self.auto_refresh_timer.setInterval(AUTO_REFRESH_MINUTES * 60 * 1000)
+        self.auto_refresh_timer.timeout.connect(self.auto_refresh)
+
+        # Archive veralteter Mods im Leerlauf vorladen, damit ein Klick auf "Update" sofort fertig ist
+        self.prefetch_action = QAction("Updates im Hintergrund vorladen", self, checkable=True)
+        self.prefetch_action.setChecked(
+            QSettings("MeinProgramm", "ModLoader").value("prefetch_updates", False, type=bool))
+        self.prefetch_action.toggled.connect(self.toggle_prefetch)
+        menu.addAction(self.prefetch_action)
+
+        # Vorgeladene Archive zusätzlich schon entpacken (kostet Platz, das Update ist dann nur ein Umbenennen)
+        self.prefetch_extract_action = QAction("Vorgeladene Updates bereits entpacken", self, checkable=True)
+        self.prefetch_extract_action.setChecked(
+            QSettings("MeinProgramm", "ModLoader").value("prefetch_extract", False, type=bool))
+        self.prefetch_extract_action.toggled.connect(self.toggle_prefetch_extract)
+        menu.addAction(self.prefetch_extract_action)
+
+        # Zeitmessung der Ladephasen (alternativ per MODLOADER_TRACE=1)
+        if QSettings("MeinProgramm", "ModLoader").value("trace_enabled", False, type=bool):
+            tracing.set_enabled(True)
+        self.trace_action = QAction("Zeitmessung aktivieren", self, checkable=True)
+        self.trace_action.setChecked(tracing.is_enabled())
+        self.trace_action.toggled.connect(self.toggle_tracing)
+        menu.addAction(self.trace_action)
+
+        export_trace_action = QAction("Zeitmessung exportieren...", self)
+        export_trace_action.triggered.connect(self.export_trace)
+        menu.addAction(export_trace_action)
+
         self.repo_changed_label = QLabel("Zuletzt geändert: Unbekannt")
         self.repo_changed_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.repo_changed_label)
@@ -44,11 +117,58 @@ class ModViewer(QMainWindow):
         self.load_button.clicked.connect(self.load_json)
         layout.addWidget(self.load_button)
 
+        self.update_all_button = QPushButton("Alle aktualisieren")
+        self.update_all_button.clicked.connect(self.handle_update_all)
+        layout.addWidget(self.update_all_button)
+
         # Tabelle zur besseren Darstellung aller MODs
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Name", "Version", "Erstellt am", "Zuletzt geändert"])
-        layout.addWidget(self.table)
+        self.mod_model = ModTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.mod_model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Spaltenbreiten nur anhand einer Stichprobe bestimmen, nicht über alle Zeilen
+        self.table.horizontalHeader().setResizeContentsPrecision(200)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.action_delegate = ActionButtonDelegate(self.table)
+        self.action_delegate.clicked.connect(self.on_action_clicked)
+        self.table.setItemDelegateForColumn(ACTION_COLUMN, self.action_delegate)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+
+        # Zweiter Reiter: kompletter Katalog mit Suche, um neue Mods zu finden und zu installieren
+        catalog_page = QWidget()
+        catalog_layout = QVBoxLayout()
+        catalog_page.setLayout(catalog_layout)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Suche nach Name, Autor oder Ordner...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.on_catalog_search)
+        catalog_layout.addWidget(self.search_edit)
+
+        self.search_result_label = QLabel("")
+        catalog_layout.addWidget(self.search_result_label)
+
+        self.catalog_model = CatalogTableModel(self)
+        self.catalog_table = QTableView()
+        self.catalog_table.setModel(self.catalog_model)
+        self.catalog_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.catalog_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.catalog_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.catalog_table.horizontalHeader().setResizeContentsPrecision(200)
+        self.catalog_table.horizontalHeader().setStretchLastSection(True)
+        self.install_delegate = ActionButtonDelegate(self.catalog_table)
+        self.install_delegate.clicked.connect(self.on_install_clicked)
+        self.catalog_table.setItemDelegateForColumn(ACTION_COLUMN, self.install_delegate)
+        catalog_layout.addWidget(self.catalog_table)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.table, INSTALLED_TAB_TITLE)
+        self.tabs.addTab(catalog_page, "Katalog")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        layout.addWidget(self.tabs)
 
         # Statusbar korrekt einfügen
         self.statusBar().showMessage("Bereit.")
@@ -56,115 +176,314 @@ class ModViewer(QMainWindow):
         self.statusBar().addPermanentWidget(self.version_label)
         self.show_mod_folder_in_statusbar()
 
+        # Hintergrund-Threads für Netzwerk und Festplattenzugriffe
+        self.thread_pool = QThreadPool.globalInstance()
+        self._refresh_worker = None
+        self._refresh_trace_start = tracing.now()
+        self._streamed_batches = 0
+        self._quiet_refresh = False
+        self._update_workers = {}
+        self._bulk_worker = None
+        self._prefetch_worker = None
+        # Vorladen läuft lange und wartet auch pausiert in seinem Thread – eigener Pool mit einem Thread,
+        # damit Updates im gemeinsamen Pool nie auf ihn warten müssen
+        self.prefetch_pool = QThreadPool(self)
+        self.prefetch_pool.setMaxThreadCount(1)
+        self.mod_watcher = None
+        self._app_update_worker = None
+        self._catalog_index_worker = None
+        self._catalog_index_stale = True
+        self.catalog_cache = CatalogCache()
+
+        # Netzwerk, Mod-Ordner und Update-Prüfung erst nach dem ersten Bild anstoßen
+        self.first_paint_seconds = None
+        self._startup_done = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._startup_done:
+            self._startup_done = True
+            # Der Timer läuft erst, wenn die Ereignisschleife das Fenster gezeichnet hat
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):
+        self.first_paint_seconds = time.perf_counter() - _PROCESS_START
+        first_paint_ms = self.first_paint_seconds * 1000
+        if first_paint_ms > FIRST_PAINT_TARGET_MS:
+            print(f"🐢 Fenster nach {first_paint_ms:.0f} ms gezeichnet (Ziel: {FIRST_PAINT_TARGET_MS} ms)")
+        else:
+            print(f"🖼️ Fenster nach {first_paint_ms:.0f} ms gezeichnet")
+
+        # Lokale MODs beim Start einmal laden
+        self.load_local_mods_into_gui()
+
+        # Automatisches initiales Laden der JSON-Daten; zeigt zuerst den zwischengespeicherten Katalog
+        self.load_json()
+
         # Update available?
         self.notify_if_update_available()
 
-        # Automatisches initiales Laden der JSON-Daten beim Start
-        self.load_json()
+        if self.auto_refresh_action.isChecked():
+            self.auto_refresh_timer.start()
 
-        # Lokale MODs beim Start einmal laden
-        self.load_local_mods_into_gui()
+        # Nur eine ausdrücklich gesetzte Einstellung überschreibt MODLOADER_ARCHIVE_CACHE_MB bzw. den Standardwert
+        settings = QSettings("MeinProgramm", "ModLoader")
+        if settings.contains("archive_cache_mb"):
+            from mod_updater import configure_archive_cache
+            configure_archive_cache(settings.value("archive_cache_mb", DEFAULT_MAX_MB, type=int))
 
     def load_json(self):
-        url = "https://modwerkstatt.com/tpfmm"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            json_data = response.json()
+        # Läuft bereits ein Ladevorgang, wirkt der Button als "Abbrechen"
+        if self._refresh_worker is not None:
+            self.cancel_refresh()
+            return
+
+        self.start_refresh(quiet=False)
 
-            mods_json = json_data["mods"]
+    def auto_refresh(self):
+        # Kein Eingriff in laufende Lade- oder Update-Vorgänge
+        if self._refresh_worker is not None or self._bulk_worker is not None:
+            return
+        self.start_refresh(quiet=True)
 
-            mod_folder = get_mod_folder_from_settings()
-            mods_local = get_mods_versions(mod_folder) if mod_folder else []
+    def toggle_auto_refresh(self, enabled):
+        settings = QSettings("MeinProgramm", "ModLoader")
+        settings.setValue("auto_refresh", enabled)
+        if enabled:
+            self.auto_refresh_timer.start()
+        else:
+            self.auto_refresh_timer.stop()
 
-            combined_mods = self.get_combined_mod_list(mods_json, mods_local)
-            self.populate_mod_table(combined_mods)
+    def start_refresh(self, quiet):
+        mod_folder = get_mod_folder_from_settings()
+        self._refresh_trace_start = tracing.now()
+        self._streamed_batches = 0
+        self._quiet_refresh = quiet
+
+        worker = RefreshWorker(mod_folder, self.get_combined_mod_list, self.catalog_cache)
+        worker.signals.cached.connect(lambda combined, w=worker: self.on_refresh_cached(w, combined))
+        worker.signals.batch.connect(lambda combined, w=worker: self.on_refresh_batch(w, combined))
+        worker.signals.finished.connect(lambda combined, w=worker: self.on_refresh_finished(w, combined))
+        worker.signals.error.connect(lambda message, w=worker: self.on_refresh_error(w, message))
+        self._refresh_worker = worker
+
+        self.load_button.setText("Abbrechen")
+        self.statusBar().showMessage("Lade Daten...")
+        self.thread_pool.start(worker)
+
+    def cancel_refresh(self):
+        worker = self._refresh_worker
+        if worker is None:
+            return
+
+        # Der Worker läuft im Hintergrund zu Ende, sein Ergebnis wird aber verworfen
+        worker.cancel()
+        self._refresh_worker = None
+        self.load_button.setText("Auffrischen")
+        if self._streamed_batches:
+            self.set_table_incomplete(True)
+        self.statusBar().showMessage("Laden abgebrochen.", 5000)
+        QTimer.singleShot(5000, self.show_mod_folder_in_statusbar)
+
+    def on_refresh_cached(self, worker, combined_mods):
+        if worker is not self._refresh_worker:
+            return
+        self.refresh_mod_table(combined_mods)
+        self.statusBar().showMessage("Zwischengespeicherte Daten angezeigt, prüfe auf Änderungen...")
 
-            # Status, Toast etc., wie gehabt
-            jetzt = datetime.now().strftime('%H:%M:%S')
-            self.statusBar().showMessage(f"Daten wurden um {jetzt} erfolgreich aktualisiert.", 5000)
+    def on_refresh_batch(self, worker, combined_mods):
+        if worker is not self._refresh_worker:
+            return
+        # Erster Teil ersetzt die alte Tabelle, weitere Teile werden angehängt
+        if self._streamed_batches == 0:
+            self.populate_mod_table(combined_mods)
+        else:
+            self.mod_model.append_mods(combined_mods)
+        self._streamed_batches += 1
+        self.statusBar().showMessage(f"Lade Katalog... {self.mod_model.rowCount()} installierte Mods gefunden")
+
+    def on_refresh_finished(self, worker, combined_mods):
+        if worker is not self._refresh_worker:
+            return  # veraltetes oder abgebrochenes Ergebnis
+        self._refresh_worker = None
+        self.load_button.setText("Auffrischen")
+        self.set_table_incomplete(False)
+
+        # None bedeutet: Katalog unverändert oder stückweise geliefert, Tabelle zeigt bereits den aktuellen Stand
+        changes = None
+        if combined_mods is not None:
+            changes = self.refresh_mod_table(combined_mods)
+        elif self._streamed_batches:
+            self.table.resizeColumnsToContents()
+
+        # Katalog kann sich geändert haben – Suchindex beim nächsten Öffnen neu bauen
+        catalog_changed = combined_mods is not None or self._streamed_batches
+        if catalog_changed:
+            self._catalog_index_stale = True
+        self.sync_catalog_installed()
+        if self.tabs.currentWidget() is not self.table:
+            self.build_catalog_index()
+
+        # Index ist jetzt frisch – ab hier reicht die Überwachung einzelner Ordner
+        if self.mod_watcher is not None and self.mod_watcher.mods_folder == get_mod_folder_from_settings():
+            self.mod_watcher.reload_index()
+        else:
+            self.start_mod_watcher()
+
+        # Neue Versionen machen Vorgeladenes ungültig; unverändert läuft ein laufendes Vorladen einfach weiter
+        if catalog_changed or self._prefetch_worker is None:
+            self.start_prefetch()
+
+        # Status, Toast etc., wie gehabt
+        jetzt = datetime.now().strftime('%H:%M:%S')
+        message = f"Daten wurden um {jetzt} erfolgreich aktualisiert."
+        if changes is not None:
+            inserted, removed, changed = changes
+            message = f"{message} {len(inserted)} neu, {removed} entfernt, {len(changed)} geändert."
+        if tracing.is_enabled():
+            # Zusammenfassung der Phasen dieses Ladevorgangs
+            summary = tracing.format_summary(tracing.summarize(self._refresh_trace_start), REFRESH_PHASES)
+            message = f"{message} {summary}"
+        self.statusBar().showMessage(message, 5000)
+        if not self._quiet_refresh:
             toast = ToastNotification("✅ Daten erfolgreich aktualisiert.", self, 3000)
             toast.show()
 
-            # nach 5 sec Mod-Ordner wieder anzeigen:
-            QTimer.singleShot(5000, self.show_mod_folder_in_statusbar)
-
-        except requests.RequestException as e:
-            QMessageBox.critical(self, "Fehler", f"Fehler beim Laden der Daten:\n{e}")
-        except KeyError as e:
-            QMessageBox.critical(self, "Fehler", f"Datenfeld fehlt in JSON:\n{e}")
+        # nach 5 sec Mod-Ordner wieder anzeigen:
+        QTimer.singleShot(5000, self.show_mod_folder_in_statusbar)
 
-    def get_combined_mod_list(self, mods_json, mods_local):
-        combined = []
+    def toggle_tracing(self, enabled):
+        settings = QSettings("MeinProgramm", "ModLoader")
+        settings.setValue("trace_enabled", enabled)
+        tracing.set_enabled(enabled)
 
-        # Lokale Daten vorbereiten
-        local_dict = {}
-        for mod_loc in mods_local:
-            foldername, major_version = split_foldername_version(mod_loc["modOrdner"])
-            local_dict[foldername] = mod_loc["version"]  # z.B. version = "1.2"
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Zeitmessung exportieren", "modloader-trace.json",
+                                              "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            tracing.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Fehler", f"Zeitmessung konnte nicht gespeichert werden:\n{e}")
+            return
+        toast = ToastNotification("✅ Zeitmessung exportiert.", self, 3000)
+        toast.show()
 
-        # JSON-Daten durchlaufen und vergleichen!
-        for mod_entry in mods_json:
-            remote_version = mod_entry.get("version", "N/A")
-            mod_name = mod_entry.get("name", "N/A")
+    def on_refresh_error(self, worker, message):
+        if worker is not self._refresh_worker:
+            return
+        self._refresh_worker = None
+        self.load_button.setText("Auffrischen")
+        self.show_mod_folder_in_statusbar()
 
-            # files könnte mehrere haben, aber laut Beispiel ist es [0]
-            try:
-                folder_fullname = mod_entry["files"][0]["foldername"]
-                foldername_json, _ = split_foldername_version(folder_fullname)
-            except (IndexError, KeyError):
-                continue
+        # Stückweise gefüllte Tabelle bleibt stehen, aber sichtbar als unvollständig markiert
+        if self._streamed_batches:
+            self.set_table_incomplete(True)
+            message = f"{message}\n\nDie Mod-Liste ist unvollständig – bitte erneut auffrischen."
 
-            if foldername_json in local_dict:
-                local_version = local_dict[foldername_json]
+        if self._quiet_refresh:
+            # Automatisches Auffrischen soll nicht mit Dialogen stören
+            print(f"⚠️ Automatisches Auffrischen fehlgeschlagen: {message}")
+            self.statusBar().showMessage("Automatisches Auffrischen fehlgeschlagen.", 5000)
+            QTimer.singleShot(5000, self.show_mod_folder_in_statusbar)
+            return
 
-                # statt manuellem Neubau hier den original JSON-Eintrag kopieren
-                # und wichtige lokale Versionsinfo ergänzen
-                mod_copy = mod_entry.copy()  # Erstelle Kopie des JSON-Mod-Entrys
-                mod_copy["local_version"] = local_version
-                mod_copy["remote_version"] = remote_version
-                mod_copy["created"] = mod_entry.get("timecreated", 0)
-                mod_copy["changed"] = mod_entry.get("timechanged", 0)
+        QMessageBox.critical(self, "Fehler", message)
 
-                combined.append(mod_copy)  # Diese Kopie enthält nun definitiv das "files"-Feld!
+    def set_table_incomplete(self, incomplete):
+        # Bleibt bis zum nächsten erfolgreichen Auffrischen sichtbar, anders als eine Statusmeldung
+        tab_index = self.tabs.indexOf(self.table)
+        self.tabs.setTabText(tab_index, INCOMPLETE_TAB_TITLE if incomplete else INSTALLED_TAB_TITLE)
+        self.tabs.setTabToolTip(tab_index, "Katalog wurde nicht vollständig geladen – bitte erneut auffrischen."
+                                if incomplete else "")
 
-        return combined
+    @traced()
+    def get_combined_mod_list(self, mods_json, mods_local):
+        # Abgleich in einem Durchlauf; je installiertem Mod nur ein schlanker ModRecord statt Kopie des Katalogeintrags
+        return [ModRecord.from_status(status) for status in diff_mods(mods_json, mods_local)]
 
+    @traced()
     def populate_mod_table(self, combined_mods):
+        self.mod_model.set_mods(combined_mods)
+        self.table.resizeColumnsToContents()
+
+        self.highlight_update_rows(combined_mods)
+
+    def refresh_mod_table(self, combined_mods):
+        # Leere Tabelle komplett füllen, sonst nur die Unterschiede einarbeiten
+        if self.mod_model.rowCount() == 0:
+            self.populate_mod_table(combined_mods)
+            return None
+
+        with tracing.span("update_mod_table"):
+            inserted, removed, changed = self.mod_model.update_mods(combined_mods)
+            self.resize_columns_for(inserted + changed)
+        return inserted, removed, changed
+
+    def resize_columns_for(self, mods):
+        # Spaltenbreite nur anpassen, wenn ein neuer Text nicht mehr hineinpasst;
+        # gemessen wird wie bei resizeColumnsToContents, aber nur für die betroffenen Zeilen
+        rows = [row for row in (self.mod_model.row_of_zip(mod.zip_filename) for mod in mods) if row is not None]
+        if not rows:
+            return
+        option = self.table.viewOptions()
+        delegate = self.table.itemDelegate()
+        grid = 1 if self.table.showGrid() else 0
+        for column in range(ACTION_COLUMN):
+            widest = max(delegate.sizeHint(option, self.mod_model.index(row, column)).width() for row in rows) + grid
+            if widest > self.table.columnWidth(column):
+                self.table.setColumnWidth(column, widest)
+
+    def start_mod_watcher(self):
+        if self.mod_watcher is not None:
+            self.mod_watcher.stop()
+            self.mod_watcher.deleteLater()
+            self.mod_watcher = None
+
+        mod_folder = get_mod_folder_from_settings()
+        if not self.watch_folder_action.isChecked() or not mod_folder or not os.path.isdir(mod_folder):
+            return
 
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(combined_mods))
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Name", "Lokale Version", "Neueste Version", "Veröffentlicht", "Geändert", "Aktion"])
+        self.mod_watcher = ModFolderWatcher(mod_folder, self)
+        self.mod_watcher.mods_changed.connect(self.on_local_mods_changed)
 
-        for row_index, mod in enumerate(combined_mods):
-            created_date = datetime.fromtimestamp(mod["created"]).strftime('%Y-%m-%d %H:%M:%S') if mod["created"] else 'N/A'
-            changed_date = datetime.fromtimestamp(mod["changed"]).strftime('%Y-%m-%d %H:%M:%S') if mod["changed"] else ''
+    def toggle_mod_watcher(self, enabled):
+        settings = QSettings("MeinProgramm", "ModLoader")
+        settings.setValue("watch_mod_folder", enabled)
+        self.start_mod_watcher()
 
-            self.table.setItem(row_index, 0, QTableWidgetItem(mod["name"]))
-            self.table.setItem(row_index, 1, QTableWidgetItem(mod["local_version"]))
-            self.table.setItem(row_index, 2, QTableWidgetItem(mod["remote_version"]))
-            self.table.setItem(row_index, 3, QTableWidgetItem(created_date))
-            self.table.setItem(row_index, 4, QTableWidgetItem(changed_date))
+    def on_local_mods_changed(self, changes):
+        # Nur betroffene Zeilen anfassen, kein kompletter Neuaufbau
+        if self.mod_watcher is None:
+            return
 
-            update_button = QPushButton("Update")
-            if mod.get("files") and len(mod["files"]) > 0:
-                zip_filename = mod["files"][0].get("filename", "unbekannt.zip")
-            else:
-                zip_filename = "unbekannt.zip"
+        local_index = build_local_index(self.mod_watcher.index.versions())
 
-            update_button.setProperty("zip_filename", zip_filename)
-            update_button.setProperty("display_name", mod["name"])  # Modanzeige zur leichteren Identifizierung
-            update_button.clicked.connect(lambda checked, btn=update_button: self.handle_update(btn))
+        affected = {split_foldername_version(mod_dir)[0] for mod_dir in changes}
 
-            self.table.setCellWidget(row_index, 5, update_button)
+        rows_to_remove = []
+        for base in affected:
+            local_version = local_index[base]["version"] if base in local_index else None
+            rows = self.mod_model.rows_of_folder(base)
 
-        self.table.resizeColumnsToContents()
-        self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.setSortingEnabled(True)
-        self.table.sortItems(0, Qt.AscendingOrder)
+            if rows and local_version is None:
+                rows_to_remove.extend(rows)
+            elif rows:
+                for row in rows:
+                    self.mod_model.set_local_version(row, local_version)
+            elif local_version is not None:
+                self.append_installed_mod(base, local_version)
 
-        self.highlight_update_rows(combined_mods)
+        self.mod_model.remove_rows(rows_to_remove)
+        self.sync_catalog_installed()
+        print(f"👀 Änderungen im Mod-Ordner übernommen: {', '.join(sorted(changes))}")
+
+    def append_installed_mod(self, base, local_version):
+        # Neu installierter Mod: Katalogeintrag aus dem Cache holen und als Zeile anhängen
+        mods_json = self.catalog_cache.load_cached() or []
+        mods_local = [{"modOrdner": base, "version": local_version}]
+        self.mod_model.append_mods(self.get_combined_mod_list(mods_json, mods_local))
 
     def select_mod_folder(self):
         # Bisher gespeicherten Pfad laden und anzeigen
@@ -184,6 +503,12 @@ class ModViewer(QMainWindow):
             # Lokale Mods erneut laden (optional):
             self.load_local_mods_into_gui()
 
+            # Überwachung auf den neuen Ordner umstellen
+            self.start_mod_watcher()
+
+            # Vorladen gehört zum alten Ordner; startet beim nächsten Auffrischen neu
+            self.cancel_prefetch()
+
     def show_mod_folder_in_statusbar(self):
         mod_folder = get_mod_folder_from_settings()
         if mod_folder:
@@ -205,7 +530,18 @@ class ModViewer(QMainWindow):
         #     print(mod_info["modOrdner"], mod_info["version"])
 
     def notify_if_update_available(self):
-        is_update, latest_version, download_url = check_for_update(APP_VERSION)
+        if self._app_update_worker is not None:
+            return
+
+        # GitHub-Abfrage im Hintergrund, das Fenster bleibt bedienbar
+        worker = AppUpdateCheckWorker(check_for_update, APP_VERSION)
+        worker.signals.finished.connect(self.on_app_update_checked)
+        self._app_update_worker = worker
+        self.thread_pool.start(worker)
+
+    def on_app_update_checked(self, result):
+        self._app_update_worker = None
+        is_update, latest_version, download_url = result
         if is_update:
             msg = QMessageBox(self)
             msg.setIcon(QMessageBox.Information)
@@ -218,162 +554,293 @@ class ModViewer(QMainWindow):
 
             if user_choice == QMessageBox.Yes:
                 # Nutzer zu GitHub Release Seite senden
+                import webbrowser
                 webbrowser.open(download_url)
 
     def highlight_update_rows(self, mods):
-        row_count = self.table.rowCount()
-
-        for row in range(row_count):
-            local_item = self.table.item(row, 1)  # Lokale Versionsspalte
-            remote_item = self.table.item(row, 2)  # Remote Versionsspalte
-
-            if local_item and remote_item:
-                local_version_text = local_item.text().strip()
-                remote_version_text = remote_item.text().strip()
-
-                if not remote_version_text:
-                    remote_version_text = "0.0"
-
-                try:
-                    local_version = parse_version(local_version_text)
-                    remote_version = parse_version(remote_version_text)
-                except Exception as e:
-                    print(f"⚠️ Fehler beim Parsen Version '{local_version_text}'/'{remote_version_text}': {e}")
-                    continue
-
-                if remote_version > local_version:
-                    # echtes Update vorhanden
-                    mod_name = self.table.item(row, 0).text()
-                    matched_mod = next((m for m in mods if m["name"] == mod_name), None)
-
-                    if matched_mod and matched_mod.get("files") and len(matched_mod["files"]) > 0:
-                        zip_filename = matched_mod["files"][0].get("filename", "unbekannt.zip")
-                    else:
-                        zip_filename = "unbekannt.zip"
-
-                    update_button = QPushButton("⬆️ Update")
-                    update_button.setProperty("zip_filename", zip_filename)  # wichtige neue Zeile!
-                    update_button.clicked.connect(lambda checked, btn=update_button: self.handle_update(btn))
-                    self.table.setCellWidget(row, 5, update_button)
-
-                    sort_item = QTableWidgetItem("1")
-                    sort_item.setData(Qt.UserRole, 1)  # Für besseres Sortieren
-                    sort_item.setTextAlignment(Qt.AlignCenter)
-                    sort_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    self.table.setItem(row, 5, sort_item)
-                else:
-                    # kein Update nötig, ggf. Knopf entfernen oder Zeile löschen
-                    self.table.setCellWidget(row, 5, None)
-
-                    sort_item = QTableWidgetItem("")
-                    sort_item.setData(Qt.UserRole, 0)
-                    sort_item.setTextAlignment(Qt.AlignCenter)
-                    sort_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    self.table.setItem(row, 5, sort_item)
-
-    def update_mod(self, zip_filename, filename_without_zip):
-        print(f"Starte Update für Datei '{zip_filename}' mit interner Bezeichnung '{filename_without_zip}'")
-
-        # URL festlegen
-        download_url = f"https://modwerkstatt.com/download/{zip_filename}"
-        print(f"⬇️ Lade Datei herunter: {download_url}")
-
-        # Temporärer Download der ZIP-Datei
-        temp_dir = tempfile.mkdtemp()
-        zip_filepath = os.path.join(temp_dir, zip_filename)
-        success = False
+        # Update-Knöpfe malt der Delegate anhand von needs_update; hier nur die Aktionsspalte neu zeichnen lassen
+        row_count = self.mod_model.rowCount()
+        if row_count:
+            self.mod_model.dataChanged.emit(self.mod_model.index(0, ACTION_COLUMN),
+                                            self.mod_model.index(row_count - 1, ACTION_COLUMN))
 
-        try:
-            response = requests.get(download_url)
-            response.raise_for_status()
-
-            if not zip_filepath.endswith(".zip"):
-                zip_filepath += ".zip"
-
-            with open(zip_filepath, 'wb') as file:
-                file.write(response.content)
-            print(f"📦 Datei heruntergeladen -> {zip_filepath}")
-
-            # Alten Mod-Ordner sauber löschen
-            mod_folder_path = os.path.join(get_mod_folder_from_settings(), filename_without_zip)
-            if os.path.exists(mod_folder_path):
-                print(f"⚠️ Lösche alten Mod-Ordner {mod_folder_path}...")
-                shutil.rmtree(mod_folder_path)
-
-            # Neuen Mod entpacken
-            os.makedirs(mod_folder_path, exist_ok=True)
-            temp_unzip_folder = os.path.join(temp_dir, "unpacked_mod")
-            shutil.unpack_archive(zip_filepath, temp_unzip_folder)
-
-            # Prüfen, ob zusätzlicher Unterordner vorhanden ist
-            extracted_items = os.listdir(temp_unzip_folder)
-
-            if len(extracted_items) == 1 and os.path.isdir(os.path.join(temp_unzip_folder, extracted_items[0])):
-                # Zusätzlicher Ordner gefunden – dessen Inhalt nach oben verschieben!
-                inner_folder_path = os.path.join(temp_unzip_folder, extracted_items[0])
-                for item in os.listdir(inner_folder_path):
-                    item_full_path = os.path.join(inner_folder_path, item)
-                    shutil.move(item_full_path, mod_folder_path)
-                print("✅ Zusätzlicher Unterordner erkannt – Inhalt erfolgreich verschoben.")
-            else:
-                # Kein zusätzlicher Ordner – alles normal verschieben
-                for item in extracted_items:
-                    item_full_path = os.path.join(temp_unzip_folder, item)
-                    shutil.move(item_full_path, mod_folder_path)
-                print("✅ Kein zusätzlicher Unterordner gefunden – Inhalt direkt entpackt.")
-
-            success = True
-            print(f"✅ Mod erfolgreich aktualisiert nach {mod_folder_path}")
-
-        except Exception as e:
-            print(f"⚠️ Fehler beim Update '{zip_filename}': {e}")
-            success = False
-
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-        return success
-
-    def handle_update(self, update_button):
-        zip_filename = update_button.property("zip_filename")
-        display_name = update_button.property("display_name") or "Unbekannter Mod"
+    def update_mod(self, zip_filename, filename_without_zip, progress_callback=None, cancel_event=None,
+                   remote_version=None):
+        from mod_updater import update_mod
+
+        return update_mod(get_mod_folder_from_settings(), zip_filename, filename_without_zip,
+                          progress_callback, cancel_event, remote_version=remote_version)
+
+    def on_action_clicked(self, row):
+        self.handle_update(self.mod_model.mod_at(row))
+
+    def handle_update(self, mod):
+        zip_filename = mod.zip_filename
+        display_name = mod.name or "Unbekannter Mod"
         filename_without_zip = zip_filename.replace('.zip', '')
 
+        if zip_filename in self._update_workers:
+            return  # läuft bereits
+
         print(f"🔄 Starte Update für Mod: {display_name} ➡️ Dateiname: {zip_filename}")
 
-        success = self.update_mod(zip_filename, filename_without_zip)
+        worker = UpdateWorker(self.update_mod, zip_filename, filename_without_zip, mod.remote_version)
+        worker.signals.progress.connect(
+            lambda downloaded, total: self.show_download_progress(zip_filename, downloaded, total))
+        worker.signals.finished.connect(
+            lambda success: self.on_update_finished(zip_filename, display_name, success))
+        self._update_workers[zip_filename] = worker
+
+        self.mod_model.set_busy_text(zip_filename, "⬇️ 0%")
+        self.pause_prefetch()
+        self.thread_pool.start(worker)
+
+    def handle_update_all(self):
+        # Zweiter Klick bricht das laufende "Alle aktualisieren" ab
+        if self._bulk_worker is not None:
+            self._bulk_worker.cancel()
+            self.update_all_button.setText("Wird abgebrochen...")
+            self.update_all_button.setEnabled(False)
+            return
+
+        mod_folder = get_mod_folder_from_settings()
+        if not mod_folder:
+            QMessageBox.warning(self, "Keine Einstellungen", "Bitte zuerst einen Mod-Ordner auswählen (Einstellungen ➜ Mod-Ordner auswählen)")
+            return
+
+        # Alle Zeilen einsammeln, die als veraltet markiert sind
+        display_names = {}
+        versions = {}
+        for mod in self.mod_model.outdated_mods():
+            zip_filename = mod.zip_filename
+            if zip_filename not in self._update_workers:
+                display_names[zip_filename] = mod.name
+                versions[zip_filename] = mod.remote_version
+
+        if not display_names:
+            self.statusBar().showMessage("Alle Mods sind aktuell.", 5000)
+            return
+
+        jobs = [(zip_filename, zip_filename.replace('.zip', ''), versions[zip_filename]) for zip_filename in display_names]
+        print(f"🔄 Starte Update für {len(jobs)} Mods")
+
+        worker = BulkUpdateWorker(mod_folder, jobs)
+        worker.signals.bulk_progress.connect(self.show_bulk_progress)
+        worker.signals.item_finished.connect(
+            lambda zip_filename, success: self.on_update_finished(zip_filename, display_names[zip_filename], success))
+        worker.signals.finished.connect(self.on_update_all_finished)
+        self._bulk_worker = worker
+
+        for zip_filename in display_names:
+            self._update_workers[zip_filename] = worker
+            self.mod_model.set_busy_text(zip_filename, "⏳ Wartet")
+
+        self.update_all_button.setText("Abbrechen")
+        self.pause_prefetch()
+        self.thread_pool.start(worker)
+
+    def show_bulk_progress(self, finished, total, downloaded, total_bytes):
+        megabytes = downloaded / (1024 * 1024)
+        if total_bytes:
+            self.statusBar().showMessage(
+                f"Aktualisiere Mods: {finished}/{total} fertig, {megabytes:.1f} von {total_bytes / (1024 * 1024):.1f} MB geladen")
+        else:
+            self.statusBar().showMessage(f"Aktualisiere Mods: {finished}/{total} fertig, {megabytes:.1f} MB geladen")
+
+    def on_update_all_finished(self, results):
+        self._bulk_worker = None
+        self.update_all_button.setText("Alle aktualisieren")
+        self.update_all_button.setEnabled(True)
+
+        succeeded = sum(1 for success in results.values() if success)
+        self.statusBar().showMessage(f"{succeeded} von {len(results)} Mods aktualisiert.", 5000)
+        QTimer.singleShot(5000, self.show_mod_folder_in_statusbar)
+
+        toast = ToastNotification(f"✅ {succeeded} von {len(results)} Mods aktualisiert.", self, 3000)
+        toast.show()
+
+    def show_download_progress(self, zip_filename, downloaded, total):
+        if total:
+            text = f"⬇️ {downloaded * 100 // total}%"
+        else:
+            text = f"⬇️ {downloaded / (1024 * 1024):.1f} MB"
+        self.mod_model.set_busy_text(zip_filename, text)
+        self.catalog_model.set_busy_text(zip_filename, text)
+
+    def on_update_finished(self, zip_filename, display_name, success):
+        self._update_workers.pop(zip_filename, None)
+        self.mod_model.set_busy_text(zip_filename, None)
+        self.catalog_model.set_busy_text(zip_filename, None)
+        if not self._update_workers:
+            self.resume_prefetch()
+
         if success:
             print(f"🎉 Update abgeschlossen für: {display_name}")
+            self.mod_model.mark_updated(zip_filename)
+            self.sync_catalog_installed()
+        else:
+            print(f"❌ Update fehlgeschlagen für: {display_name}")
+
+    def start_prefetch(self):
+        self.cancel_prefetch()
+        mod_folder = get_mod_folder_from_settings()
+        if not self.prefetch_action.isChecked() or not mod_folder:
+            return
 
-            current_row = self.table.indexAt(update_button.pos()).row()
-            remote_version = self.table.item(current_row, 2).text().strip()
-            self.table.item(current_row, 1).setText(remote_version)
+        # Auch ohne ausstehende Updates starten – der Durchlauf räumt veraltete vorgeladene Stände weg
+        jobs = [(mod.zip_filename, mod.zip_filename.replace('.zip', ''), mod.remote_version)
+                for mod in self.mod_model.outdated_mods() if mod.zip_filename not in self._update_workers]
+        kbps = QSettings("MeinProgramm", "ModLoader").value("prefetch_kbps", PREFETCH_DEFAULT_KBPS, type=int)
+
+        worker = PrefetchWorker(mod_folder, jobs, kbps * 1024, self.prefetch_extract_action.isChecked())
+        worker.signals.finished.connect(lambda results, w=worker: self.on_prefetch_finished(w, results))
+        self._prefetch_worker = worker
+        if self._update_workers:
+            worker.pause()
+        self.prefetch_pool.start(worker)
+
+    def cancel_prefetch(self):
+        if self._prefetch_worker is not None:
+            self._prefetch_worker.cancel()
+            self._prefetch_worker = None
+
+    def clear_prefetch(self):
+        # Ein Durchlauf ohne Jobs gibt die geschützten Archive frei und räumt vorab entpackte Stände weg
+        self.cancel_prefetch()
+        mod_folder = get_mod_folder_from_settings()
+        if mod_folder:
+            self.prefetch_pool.start(PrefetchWorker(mod_folder, [], 0))
 
-            self.table.setCellWidget(current_row, 5, None)
+    def pause_prefetch(self):
+        # Vom Nutzer angestoßene Downloads bekommen die volle Bandbreite
+        if self._prefetch_worker is not None:
+            self._prefetch_worker.pause()
 
-            from PyQt5.QtCore import Qt
-            sort_item = QTableWidgetItem("")
-            sort_item.setData(Qt.UserRole, 0)
-            sort_item.setTextAlignment(Qt.AlignCenter)
-            sort_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.table.setItem(current_row, 5, sort_item)
+    def resume_prefetch(self):
+        if self._prefetch_worker is not None:
+            self._prefetch_worker.resume()
+
+    def on_prefetch_finished(self, worker, results):
+        if worker is not self._prefetch_worker:
+            return
+        self._prefetch_worker = None
+        prefetched = sum(1 for success in results.values() if success)
+        if prefetched:
+            print(f"📥 {prefetched} von {len(results)} Updates vorgeladen")
+
+    def toggle_prefetch(self, enabled):
+        settings = QSettings("MeinProgramm", "ModLoader")
+        settings.setValue("prefetch_updates", enabled)
+        if enabled:
+            self.start_prefetch()
         else:
-            print(f"❌ Update fehlgeschlagen für: {display_name}")
+            self.clear_prefetch()
+
+    def toggle_prefetch_extract(self, enabled):
+        settings = QSettings("MeinProgramm", "ModLoader")
+        settings.setValue("prefetch_extract", enabled)
+        if self.prefetch_action.isChecked():
+            self.start_prefetch()
+
+    def closeEvent(self, event):
+        # Vorladen nicht über das Programmende hinaus laufen lassen
+        self.cancel_prefetch()
+        super().closeEvent(event)
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is not self.table:
+            self.build_catalog_index()
+            self.search_edit.setFocus()
+
+    def build_catalog_index(self):
+        if not self._catalog_index_stale or self._catalog_index_worker is not None:
+            return
+
+        worker = CatalogIndexWorker(self.catalog_cache)
+        worker.signals.finished.connect(self.on_catalog_index_built)
+        worker.signals.error.connect(self.on_catalog_index_error)
+        self._catalog_index_worker = worker
+        self._catalog_index_stale = False
+        self.search_result_label.setText("Erstelle Suchindex...")
+        self.thread_pool.start(worker)
+
+    def on_catalog_index_built(self, search_index):
+        self._catalog_index_worker = None
+        self.catalog_model.set_index(search_index, self.search_edit.text())
+        self.sync_catalog_installed()
+        self.catalog_table.resizeColumnsToContents()
+        self.search_result_label.setText(f"{self.catalog_model.rowCount()} von {len(search_index)} Mods")
+
+        # Hat sich der Katalog inzwischen erneut geändert, gleich noch einmal bauen
+        if self._catalog_index_stale and self.tabs.currentWidget() is not self.table:
+            self.build_catalog_index()
+
+    def on_catalog_index_error(self, message):
+        self._catalog_index_worker = None
+        self._catalog_index_stale = True
+        self.search_result_label.setText(message)
+
+    def on_catalog_search(self, text):
+        # Nur der Index wird befragt, die Katalogliste selbst wird nicht durchlaufen
+        if not self.catalog_model.has_index():
+            return
+        start = time.perf_counter()
+        count = self.catalog_model.set_query(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.search_result_label.setText(f"{count} Treffer ({elapsed_ms:.1f} ms)")
 
+    def sync_catalog_installed(self):
+        self.catalog_model.set_installed({mod.folder_base: mod.local_version for mod in self.mod_model.mods()})
+
+    def on_install_clicked(self, row):
+        self.handle_install(self.catalog_model.entry_at(row))
+
+    def handle_install(self, entry):
+        zip_filename = catalog_zip_filename(entry)
+        folder_base = catalog_folder_base(entry)
+        display_name = entry.get("name") or "Unbekannter Mod"
+        remote_version = str(entry.get("version", ""))
+
+        if zip_filename in self._update_workers or folder_base is None:
+            return
+
+        if not get_mod_folder_from_settings():
+            QMessageBox.warning(self, "Keine Einstellungen", "Bitte zuerst einen Mod-Ordner auswählen (Einstellungen ➜ Mod-Ordner auswählen)")
+            return
+
+        print(f"⬇️ Installiere Mod: {display_name} ➡️ Dateiname: {zip_filename}")
+
+        worker = UpdateWorker(self.update_mod, zip_filename, zip_filename.replace('.zip', ''), remote_version)
+        worker.signals.progress.connect(
+            lambda downloaded, total: self.show_download_progress(zip_filename, downloaded, total))
+        worker.signals.finished.connect(
+            lambda success: self.on_install_finished(zip_filename, display_name, folder_base, remote_version, success))
+        self._update_workers[zip_filename] = worker
+
+        self.catalog_model.set_busy_text(zip_filename, "⬇️ 0%")
+        self.pause_prefetch()
+        self.thread_pool.start(worker)
+
+    def on_install_finished(self, zip_filename, display_name, folder_base, remote_version, success):
+        self.on_update_finished(zip_filename, display_name, success)
+        if not success:
+            return
+
+        # Die Ordnerüberwachung kann den neuen Mod schon übernommen haben
+        if not self.mod_model.rows_of_folder(folder_base):
+            self.append_installed_mod(folder_base, remote_version)
+        self.sync_catalog_installed()
+
+        toast = ToastNotification(f"✅ {display_name} installiert.", self, 3000)
+        toast.show()
 
-def split_foldername_version(folder_fullname):
-    # Regex Muster um _Zahlen (Version) hinten abzutrennen
-    match = re.match(r"(.+?)_(\d+)$", folder_fullname)
-    if match:
-        # (Basisname, Major-Version)
-        return match.group(1), int(match.group(2))
-    else:
-        return folder_fullname, None  # kein Match / keine Zahl hinten
 
 def get_latest_github_version():
+    import requests
+
     url = "https://api.github.com/repos/ModWerkstatt/modloader/releases/latest"
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=GITHUB_TIMEOUT)
         response.raise_for_status()  # Fehler werfen, wenn Status nicht 200 ist
         latest_release = response.json()
         latest_tag = latest_release["tag_name"]
@@ -383,16 +850,23 @@ def get_latest_github_version():
         return None, None  # bei einem Problem (Netzwerk/Fehler) nichts tun
 
 def check_for_update(current_version):
+    from packaging.version import parse as parse_version, InvalidVersion
+
     latest_version, latest_url = get_latest_github_version()
-    if latest_version and version.parse(latest_version) > version.parse(current_version):
+    try:
+        is_newer = bool(latest_version) and parse_version(latest_version) > parse_version(current_version)
+    except InvalidVersion:
+        is_newer = False  # z. B. Tag ohne Versionsnummer
+    if is_newer:
         return True, latest_version, latest_url  # neue Version vorhanden
     return False, latest_version, None  # kein Update verfügbar
 
 
 def main():
     app = QApplication(sys.argv)
-    viewer = ModViewer()
-    viewer.show()
+    with tracing.span("startup"):
+        viewer = ModViewer()
+        viewer.show()
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,373 @@
+from datetime import datetime
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, pyqtSignal
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+from operator import attrgetter
+from update_check import catalog_folder_base, catalog_folder_name, catalog_zip_filename
+from catalog_search import catalog_author
+
+COLUMN_HEADERS = ["Name", "Lokale Version", "Neueste Version", "Veröffentlicht", "Geändert", "Aktion"]
+ACTION_COLUMN = 5
+UPDATE_BUTTON_TEXT = "⬆️ Update"
+
+CATALOG_COLUMN_HEADERS = ["Name", "Autor", "Ordner", "Neueste Version", "Installiert", "Aktion"]
+INSTALL_BUTTON_TEXT = "⬇️ Installieren"
+
+# Sortierschlüssel je Spalte, direkt auf den ModRecord-Attributen
+SORT_KEYS = {
+    0: attrgetter("name"),
+    1: attrgetter("local_version"),
+    2: attrgetter("remote_version"),
+    3: attrgetter("created"),
+    4: attrgetter("changed"),
+    ACTION_COLUMN: attrgetter("needs_update"),
+}
+
+
+def _row_key(mod):
+    return mod.folder_base, mod.zip_filename
+
+
+def _row_values(mod):
+    # Alles, was die Tabelle anzeigt oder wonach sie sortiert
+    return mod.name, mod.local_version, mod.remote_version, mod.created, mod.changed, mod.needs_update
+
+
+def _insert_position(mods, sort_key, key, descending):
+    # Wie bisect_right, auch für absteigend sortierte Zeilen: hinter gleichen Einträgen einfügen,
+    # so wie ein stabiles Sortieren angehängte Zeilen einordnet
+    low, high = 0, len(mods)
+    while low < high:
+        middle = (low + high) // 2
+        if (sort_key(mods[middle]) < key) if descending else (key < sort_key(mods[middle])):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _format_timestamp(timestamp, empty):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else empty
+
+
+class ModTableModel(QAbstractTableModel):
+    # Hält die kombinierte Mod-Liste; die View fragt nur sichtbare Zellen ab
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mods = []
+        self._row_by_zip = None  # wird erst bei Bedarf (neu) aufgebaut
+        self._busy_text = {}  # zip_filename -> Fortschrittsanzeige in der Aktionsspalte
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._mods)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        mod = self._mods[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            return self.display_text(mod, column)
+        elif role == Qt.TextAlignmentRole and column == ACTION_COLUMN:
+            return Qt.AlignCenter
+        elif role == Qt.UserRole:
+            return mod
+
+        return None
+
+    def display_text(self, mod, column):
+        if column == 0:
+            return mod.name
+        if column == 1:
+            return mod.local_version
+        if column == 2:
+            return mod.remote_version
+        if column == 3:
+            return _format_timestamp(mod.created, 'N/A')
+        if column == 4:
+            return _format_timestamp(mod.changed, '')
+        if column == ACTION_COLUMN:
+            return self.action_text(mod)
+        return None
+
+    def action_text(self, mod):
+        busy_text = self._busy_text.get(mod.zip_filename)
+        if busy_text is not None:
+            return busy_text
+        return UPDATE_BUTTON_TEXT if mod.needs_update else ""
+
+    def is_busy(self, mod):
+        return mod.zip_filename in self._busy_text
+
+    def can_act(self, mod):
+        return mod.needs_update and not self.is_busy(mod)
+
+    def mod_at(self, row):
+        return self._mods[row]
+
+    def mods(self):
+        return self._mods
+
+    def set_mods(self, combined_mods):
+        self.beginResetModel()
+        self._mods = list(combined_mods)
+        self._sort_rows()
+        self.endResetModel()
+
+    def update_mods(self, combined_mods):
+        # Neue Liste per Ordner-Schlüssel abgleichen und nur eingefügte, entfernte oder geänderte
+        # Zeilen anfassen – Auswahl und Scrollposition der View bleiben so erhalten.
+        # Liefert (neue Einträge, Anzahl entfernt, geänderte Einträge).
+        new_by_key = {}
+        for mod in combined_mods:
+            new_by_key.setdefault(_row_key(mod), mod)
+        if len(new_by_key) != len(combined_mods) or len({_row_key(mod) for mod in self._mods}) != len(self._mods):
+            # Doppelte Schlüssel lassen sich nicht eindeutig zuordnen
+            self.set_mods(combined_mods)
+            return list(combined_mods), 0, []
+
+        removed_rows = []
+        changed = []
+        resort = False
+        sort_key = SORT_KEYS.get(self._sort_column, SORT_KEYS[ACTION_COLUMN])
+        for row, mod in enumerate(self._mods):
+            new_mod = new_by_key.pop(_row_key(mod), None)
+            if new_mod is None:
+                removed_rows.append(row)
+            elif _row_values(new_mod) != _row_values(mod):
+                resort = resort or sort_key(new_mod) != sort_key(mod)
+                self._mods[row] = new_mod
+                changed.append(new_mod)
+                self._emit_row_changed(row, 0, ACTION_COLUMN)
+        inserted = list(new_by_key.values())  # übrig bleiben nur neue Einträge
+
+        if removed_rows:
+            self.remove_rows(removed_rows)
+        if resort:
+            # Erst neu sortieren – die Binärsuche in append_mods setzt eine sortierte Liste voraus
+            self.sort(self._sort_column, self._sort_order)
+        if inserted:
+            self.append_mods(inserted)  # fügt an der Sortierposition ein
+        return inserted, len(removed_rows), changed
+
+    def outdated_mods(self):
+        return [mod for mod in self._mods if mod.needs_update and not self.is_busy(mod)]
+
+    def row_of_zip(self, zip_filename):
+        if self._row_by_zip is None:
+            self._row_by_zip = {mod.zip_filename: row for row, mod in enumerate(self._mods)}
+        return self._row_by_zip.get(zip_filename)
+
+    def rows_of_folder(self, folder_base):
+        return [row for row, mod in enumerate(self._mods) if mod.folder_base == folder_base]
+
+    def set_busy_text(self, zip_filename, text):
+        if text is None:
+            self._busy_text.pop(zip_filename, None)
+        else:
+            self._busy_text[zip_filename] = text
+        self._emit_row_changed(self.row_of_zip(zip_filename), ACTION_COLUMN, ACTION_COLUMN)
+
+    def set_local_version(self, row, local_version):
+        self._mods[row].set_local_version(local_version)
+        self._emit_row_changed(row, 1, ACTION_COLUMN)
+
+    def mark_updated(self, zip_filename):
+        row = self.row_of_zip(zip_filename)
+        if row is not None:
+            self.set_local_version(row, self._mods[row].remote_version.strip())
+
+    def remove_rows(self, rows):
+        for row in sorted(rows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._mods[row]
+            self.endRemoveRows()
+        self._rebuild_lookup()
+
+    def append_mods(self, new_mods):
+        # Neue Zeilen per Binärsuche an ihre Stelle einfügen, statt die ganze Tabelle neu zu sortieren
+        if not new_mods:
+            return
+        key = SORT_KEYS.get(self._sort_column, SORT_KEYS[ACTION_COLUMN])
+        descending = self._sort_order == Qt.DescendingOrder
+
+        # Zusammenhängende Läufe je Einfügeposition; von hinten eingefügt bleiben die vorderen Positionen gültig
+        runs = []
+        for mod in sorted(new_mods, key=key, reverse=descending):
+            position = _insert_position(self._mods, key, key(mod), descending)
+            if runs and runs[-1][0] == position:
+                runs[-1][1].append(mod)
+            else:
+                runs.append((position, [mod]))
+
+        for position, run in reversed(runs):
+            self.beginInsertRows(QModelIndex(), position, position + len(run) - 1)
+            self._mods[position:position] = run
+            self.endInsertRows()
+        self._rebuild_lookup()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        # Auswahl und aktuelle Zeile der View wandern mit ihren Einträgen mit
+        persistent = self.persistentIndexList()
+        persistent_mods = [self._mods[index.row()] for index in persistent]
+        self._sort_rows()
+        if persistent:
+            row_of_mod = {id(mod): row for row, mod in enumerate(self._mods)}
+            self.changePersistentIndexList(persistent, [self.index(row_of_mod[id(mod)], index.column())
+                                                        for index, mod in zip(persistent, persistent_mods)])
+        self.layoutChanged.emit()
+
+    def _sort_rows(self):
+        column = self._sort_column
+        key = SORT_KEYS.get(column, SORT_KEYS[ACTION_COLUMN])
+
+        self._mods.sort(key=key, reverse=self._sort_order == Qt.DescendingOrder)
+        self._rebuild_lookup()
+
+    def _rebuild_lookup(self):
+        # Zeilennummern haben sich verschoben; beim Streamen wird so nicht nach jedem Teil neu aufgebaut
+        self._row_by_zip = None
+
+    def _emit_row_changed(self, row, first_column, last_column):
+        if row is not None:
+            self.dataChanged.emit(self.index(row, first_column), self.index(row, last_column))
+
+
+class CatalogTableModel(QAbstractTableModel):
+    # Kompletter Katalog zum Stöbern; angezeigt werden nur die Treffer der Suche (Positionen im Suchindex)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._index = None
+        self._rows = []
+        self._installed = {}  # Ordner-Basisname -> lokale Version
+        self._busy_text = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(CATALOG_COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return CATALOG_COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entry_at(index.row())
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return entry.get("name") or ""
+            if column == 1:
+                return catalog_author(entry)
+            if column == 2:
+                return catalog_folder_name(entry) or ""
+            if column == 3:
+                return str(entry.get("version", "N/A"))
+            if column == 4:
+                return self._installed.get(catalog_folder_base(entry), "")
+            if column == ACTION_COLUMN:
+                return self.action_text(entry)
+        elif role == Qt.TextAlignmentRole and column == ACTION_COLUMN:
+            return Qt.AlignCenter
+        elif role == Qt.UserRole:
+            return entry
+
+        return None
+
+    def action_text(self, entry):
+        busy_text = self._busy_text.get(catalog_zip_filename(entry))
+        if busy_text is not None:
+            return busy_text
+        return "" if self.is_installed(entry) else INSTALL_BUTTON_TEXT
+
+    def is_installed(self, entry):
+        return catalog_folder_base(entry) in self._installed
+
+    def is_busy(self, entry):
+        return catalog_zip_filename(entry) in self._busy_text
+
+    def can_act(self, entry):
+        return not self.is_installed(entry) and not self.is_busy(entry)
+
+    def entry_at(self, row):
+        return self._index.entries[self._rows[row]]
+
+    def has_index(self):
+        return self._index is not None
+
+    def set_index(self, search_index, query=""):
+        self.beginResetModel()
+        self._index = search_index
+        self._rows = search_index.search(query)
+        self.endResetModel()
+
+    def set_query(self, query):
+        # Nur die Trefferliste tauschen, die View fragt danach ausschließlich sichtbare Zeilen ab
+        if self._index is None:
+            return 0
+        self.beginResetModel()
+        self._rows = self._index.search(query)
+        self.endResetModel()
+        return len(self._rows)
+
+    def set_installed(self, installed):
+        self._installed = dict(installed)
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 4), self.index(len(self._rows) - 1, ACTION_COLUMN))
+
+    def set_busy_text(self, zip_filename, text):
+        if text is None:
+            self._busy_text.pop(zip_filename, None)
+        else:
+            self._busy_text[zip_filename] = text
+        # Welche Zeile betroffen ist, ist nach einer Suche unbekannt – sichtbare Aktionsspalte neu zeichnen
+        if self._rows:
+            self.dataChanged.emit(self.index(0, ACTION_COLUMN), self.index(len(self._rows) - 1, ACTION_COLUMN))
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    # Malt den Update-Knopf nur für sichtbare Zeilen, statt pro Zeile ein echtes QPushButton anzulegen
+    clicked = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.DisplayRole)
+        if not text:
+            super().paint(painter, option, index)
+            return
+
+        mod = index.data(Qt.UserRole)
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = text
+        button.state = QStyle.State_Raised
+        if index.model().can_act(mod):
+            button.state |= QStyle.State_Enabled
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            mod = index.data(Qt.UserRole)
+            if model.can_act(mod) and option.rect.contains(event.pos()):
+                self.clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,659 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from app_paths import get_cache_dir
+from downloader import download_file, DownloadCancelled
+from archive_cache import ArchiveCache
+from tracing import span
+from delta_install import stage_delta, write_manifest_for_archive, write_manifest_for_entries, discard_manifest
+
+DOWNLOAD_BASE_URL = os.environ.get("MODLOADER_DOWNLOAD_URL", "https://modwerkstatt.com/download/")
+MAX_PARALLEL_DOWNLOADS = 4
+# Alle Archive liegen auf demselben Server – ohne eigene Grenze würde der Pool ihn voll ausreizen.
+# Die übrigen Pool-Threads prüfen derweil den Cache oder warten auf freie Installations-Plätze.
+MAX_CONNECTIONS_PER_HOST = 2
+PREFETCH_BYTES_PER_SECOND = 1024 * 1024
+PREFETCH_DIR_PREFIX = ".modloader-prefetch-"
+PREFETCH_META_FILENAME = "prefetch.json"
+# Anteil der Archiv-Cache-Grenze, den vorgeladene Archive samt vorab entpackter Stände belegen dürfen –
+# der Rest bleibt für vom Nutzer geladene Archive, und vorgeladene verdrängen sich nicht gegenseitig
+PREFETCH_CACHE_SHARE = 0.5
+
+_session = None
+_session_lock = threading.Lock()
+_archive_cache = None
+_prestage_lock = threading.Lock()
+
+
+def get_shared_session():
+    # Eine Keep-Alive-Session für alle Downloads, Verbindungen werden wiederverwendet
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Einzel-Updates laufen neben "Alle aktualisieren", daher so viele Verbindungen vorhalten wie der Pool hat
+            adapter = HTTPAdapter(pool_connections=MAX_PARALLEL_DOWNLOADS, pool_maxsize=MAX_PARALLEL_DOWNLOADS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_archive_cache():
+    global _archive_cache
+    with _session_lock:
+        if _archive_cache is None:
+            _archive_cache = ArchiveCache()
+        return _archive_cache
+
+
+def configure_archive_cache(max_megabytes):
+    # Größengrenze aus Einstellungen oder Kommandozeile übernehmen
+    get_archive_cache().max_bytes = int(max_megabytes) * 1024 * 1024
+
+
+def download_mod_archive(zip_filename, progress_callback=None, cancel_event=None, session=None,
+                         remote_version=None, download_dir=None):
+    download_url = f"{DOWNLOAD_BASE_URL}{zip_filename}"
+    print(f"⬇️ Lade Datei herunter: {download_url}")
+
+    # Download landet im Cache-Ordner, damit abgebrochene Übertragungen fortgesetzt werden können
+    zip_filepath = os.path.join(download_dir or get_cache_dir("downloads"), zip_filename)
+    if not zip_filepath.endswith(".zip"):
+        zip_filepath += ".zip"
+
+    download_file(download_url, zip_filepath, progress_callback, cancel_event, session or get_shared_session())
+    print(f"📦 Datei heruntergeladen -> {zip_filepath}")
+
+    # Für Neuinstallationen, Rollbacks und weitere Installationen aufheben
+    return get_archive_cache().store(zip_filename, remote_version, zip_filepath)
+
+
+def find_cached_archive(zip_filename, remote_version):
+    cached_path = get_archive_cache().lookup(zip_filename, remote_version)
+    if cached_path:
+        print(f"📦 Archiv aus dem Cache: {zip_filename} ({remote_version})")
+    return cached_path
+
+
+def install_mod_archive(zip_filepath, mods_folder, filename_without_zip):
+    # Entpacken in ein Staging-Verzeichnis auf demselben Dateisystem, dann per os.replace austauschen.
+    # Der alte Stand bleibt bis zum erfolgreichen Tausch erhalten und wird bei Fehlern zurückgeholt.
+    mod_folder_path = os.path.join(mods_folder, filename_without_zip)
+    staging_dir = tempfile.mkdtemp(prefix=".modloader-staging-", dir=_staging_parent(mods_folder))
+
+    try:
+        new_mod_path = _extract_archive(zip_filepath, staging_dir)
+        _swap_into_place(new_mod_path, mod_folder_path, staging_dir)
+        _write_manifest(zip_filepath, mods_folder, filename_without_zip)
+        return mod_folder_path
+    finally:
+        # Enthält nach Erfolg nur noch die alte Version
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _extract_archive(zip_filepath, staging_dir):
+    temp_unzip_folder = os.path.join(staging_dir, "unpacked_mod")
+    with span("extract", archive=os.path.basename(zip_filepath), bytes=os.path.getsize(zip_filepath)):
+        shutil.unpack_archive(zip_filepath, temp_unzip_folder)
+
+    # Prüfen, ob zusätzlicher Unterordner vorhanden ist
+    extracted_items = os.listdir(temp_unzip_folder)
+
+    if len(extracted_items) == 1 and os.path.isdir(os.path.join(temp_unzip_folder, extracted_items[0])):
+        # Zusätzlicher Ordner gefunden – dieser wird direkt zum Mod-Ordner
+        print("✅ Zusätzlicher Unterordner erkannt – wird direkt übernommen.")
+        return os.path.join(temp_unzip_folder, extracted_items[0])
+
+    print("✅ Kein zusätzlicher Unterordner gefunden – Inhalt direkt übernommen.")
+    return temp_unzip_folder
+
+
+def _swap_into_place(new_mod_path, mod_folder_path, staging_dir):
+    backup_path = None
+    if os.path.exists(mod_folder_path):
+        backup_path = os.path.join(staging_dir, "previous_version")
+        os.replace(mod_folder_path, backup_path)
+
+    try:
+        os.replace(new_mod_path, mod_folder_path)
+    except OSError:
+        if backup_path:
+            print(f"⚠️ Austausch fehlgeschlagen, stelle alten Mod-Ordner {mod_folder_path} wieder her...")
+            os.replace(backup_path, mod_folder_path)
+        raise
+
+    print(f"✅ Mod erfolgreich aktualisiert nach {mod_folder_path}")
+
+
+def _write_manifest(zip_filepath, mods_folder, filename_without_zip):
+    # Stand für spätere Delta-Updates festhalten
+    try:
+        write_manifest_for_archive(zip_filepath, mods_folder, filename_without_zip)
+    except (OSError, zipfile.BadZipFile) as e:
+        discard_manifest(mods_folder, filename_without_zip)
+        print(f"⚠️ Manifest für {filename_without_zip} konnte nicht geschrieben werden: {e}")
+
+
+def _prefetch_root(mods_folder):
+    # Je Mod-Ordner ein eigener Bereich neben den Staging-Verzeichnissen (gleiches Dateisystem)
+    mods_folder = os.path.abspath(mods_folder)
+    digest = hashlib.sha1(os.path.normcase(mods_folder).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(_staging_parent(mods_folder), f"{PREFETCH_DIR_PREFIX}{digest}")
+
+
+def _prestaged_path(mods_folder, filename_without_zip):
+    return os.path.join(_prefetch_root(mods_folder), re.sub(r"[^\w.-]", "_", filename_without_zip))
+
+
+def _read_prestaged_meta(prestaged_path):
+    try:
+        with open(os.path.join(prestaged_path, PREFETCH_META_FILENAME), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def prestaged_size(mods_folder, filename_without_zip, remote_version):
+    # Größe des vorab entpackten Stands; None, wenn keiner (in passender Version) bereitliegt
+    meta = _read_prestaged_meta(_prestaged_path(mods_folder, filename_without_zip))
+    if meta is None or meta.get("version") != remote_version:
+        return None
+    return meta.get("bytes", 0)
+
+
+def _extracted_size(zip_filepath):
+    with zipfile.ZipFile(zip_filepath) as zip_file:
+        return sum(info.file_size for info in zip_file.infolist())
+
+
+def prestage_mod_archive(zip_filepath, mods_folder, filename_without_zip, remote_version):
+    # Archiv schon vorab entpacken; ein späteres Update muss dann nur noch austauschen
+    root = _prefetch_root(mods_folder)
+    os.makedirs(root, exist_ok=True)
+    partial_dir = tempfile.mkdtemp(prefix=".partial-", dir=root)
+    try:
+        new_mod_path = _extract_archive(zip_filepath, partial_dir)
+        meta = {
+            "version": remote_version,
+            "archive_path": os.path.abspath(zip_filepath),
+            "mod_path": os.path.relpath(new_mod_path, partial_dir),
+            "bytes": _extracted_size(zip_filepath),
+        }
+        with open(os.path.join(partial_dir, PREFETCH_META_FILENAME), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+
+        prestaged_path = _prestaged_path(mods_folder, filename_without_zip)
+        with _prestage_lock:
+            shutil.rmtree(prestaged_path, ignore_errors=True)
+            os.replace(partial_dir, prestaged_path)
+        return prestaged_path
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+
+
+def install_prestaged(mods_folder, filename_without_zip, remote_version):
+    # Vorab entpacktes Update übernehmen; False, wenn keins (in passender Version) bereitliegt
+    prestaged_path = _prestaged_path(mods_folder, filename_without_zip)
+    with _prestage_lock:
+        meta = _read_prestaged_meta(prestaged_path)
+        if meta is None:
+            return False
+        try:
+            if not remote_version or meta.get("version") != remote_version:
+                return False
+
+            _swap_into_place(os.path.join(prestaged_path, meta["mod_path"]),
+                             os.path.join(mods_folder, filename_without_zip), prestaged_path)
+            print(f"⚡ Vorbereitetes Update übernommen: {filename_without_zip} ({remote_version})")
+        finally:
+            # Nach dem Tausch liegt hier nur noch die alte Version, bei falscher Version ist es veraltet
+            shutil.rmtree(prestaged_path, ignore_errors=True)
+
+    # Archiv liegt im Cache, das Manifest braucht nur dessen Inhaltsverzeichnis
+    if os.path.exists(meta["archive_path"]):
+        _write_manifest(meta["archive_path"], mods_folder, filename_without_zip)
+    else:
+        discard_manifest(mods_folder, filename_without_zip)
+    return True
+
+
+def discard_prestaged(mods_folder, keep=None):
+    # Alles verwerfen, was nicht mehr zu einem ausstehenden Update passt (keep: Ordnername -> Version)
+    keep = keep or {}
+    root = _prefetch_root(mods_folder)
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return 0
+
+    wanted = {_prestaged_path(mods_folder, mod_dir): version for mod_dir, version in keep.items()}
+    removed = 0
+    with _prestage_lock:
+        for name in names:
+            path = os.path.join(root, name)
+            meta = _read_prestaged_meta(path)
+            if meta is None or path not in wanted or meta.get("version") != wanted[path]:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+    return removed
+
+
+def _staging_parent(mods_folder):
+    # Neben dem Mod-Ordner, sofern dort schreibbar und auf demselben Dateisystem – sonst im Mod-Ordner selbst
+    # (Punkt-Präfix und keine mod.lua auf oberster Ebene: wird beim Scannen ignoriert)
+    mods_folder = os.path.abspath(mods_folder)
+    parent = os.path.dirname(mods_folder)
+    try:
+        if os.access(parent, os.W_OK) and os.stat(parent).st_dev == os.stat(mods_folder).st_dev:
+            return parent
+    except OSError:
+        pass
+    return mods_folder
+
+
+def try_delta_update(mods_folder, zip_filename, filename_without_zip, cancel_event=None, session=None):
+    # Nur geänderte Einträge per HTTP-Range holen; False heißt: komplett laden.
+    # Geschrieben wird in eine (hart verlinkte) Kopie, die wie bei install_mod_archive als Ganzes getauscht wird –
+    # Abbruch oder Fehler mittendrin lassen den installierten Mod unverändert.
+    staging_dir = tempfile.mkdtemp(prefix=".modloader-staging-", dir=_staging_parent(mods_folder))
+    try:
+        with span("delta_update", archive=zip_filename) as delta_span:
+            staged = stage_delta(f"{DOWNLOAD_BASE_URL}{zip_filename}", mods_folder, filename_without_zip,
+                                 staging_dir, session or get_shared_session(), cancel_event)
+            if staged is None:
+                return False
+            staged_path, entries, stats = staged
+            delta_span.set(bytes=stats["bytes_downloaded"], written=stats["written"])
+            _swap_into_place(staged_path, os.path.join(mods_folder, filename_without_zip), staging_dir)
+    except DownloadCancelled:
+        raise
+    except Exception as e:
+        print(f"⚠️ Delta-Update für '{zip_filename}' nicht möglich, lade komplett: {e}")
+        discard_manifest(mods_folder, filename_without_zip)
+        return False
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    try:
+        write_manifest_for_entries(mods_folder, filename_without_zip, entries)
+    except OSError as e:
+        discard_manifest(mods_folder, filename_without_zip)
+        print(f"⚠️ Manifest für {filename_without_zip} konnte nicht geschrieben werden: {e}")
+
+    print(f"✅ Delta-Update {filename_without_zip}: {stats['written']} Dateien geschrieben, "
+          f"{stats['removed']} entfernt, {stats['unchanged']} unverändert, "
+          f"{stats['bytes_downloaded']} von {stats['archive_size']} Bytes geladen")
+    return True
+
+
+def update_mod(mods_folder, zip_filename, filename_without_zip, progress_callback=None, cancel_event=None,
+               session=None, delta=True, remote_version=None):
+    print(f"Starte Update für Datei '{zip_filename}' mit interner Bezeichnung '{filename_without_zip}'")
+
+    zip_filepath = None
+    try:
+        # Reihenfolge: vorab entpacktes Update, lokaler Archiv-Cache, Delta per Range, kompletter Download
+        if install_prestaged(mods_folder, filename_without_zip, remote_version):
+            return True
+
+        zip_filepath = find_cached_archive(zip_filename, remote_version)
+        if zip_filepath is None:
+            if delta and try_delta_update(mods_folder, zip_filename, filename_without_zip, cancel_event, session):
+                return True
+            zip_filepath = download_mod_archive(zip_filename, progress_callback, cancel_event, session,
+                                                remote_version)
+
+        install_mod_archive(zip_filepath, mods_folder, filename_without_zip)
+        return True
+
+    except DownloadCancelled:
+        print(f"⏹️ Download abgebrochen: '{zip_filename}'")
+        return False
+
+    except Exception as e:
+        print(f"⚠️ Fehler beim Update '{zip_filename}': {e}")
+        return False
+
+    finally:
+        _discard_archive(zip_filepath)
+
+
+def _discard_archive(zip_filepath):
+    # Archive im Cache bleiben liegen (nur die Sperre wird freigegeben); sonst wird die vollständige ZIP
+    # nicht mehr gebraucht und nur eine ".part"-Datei bleibt für die Fortsetzung liegen
+    if not zip_filepath:
+        return
+    cache = get_archive_cache()
+    if cache.contains_path(zip_filepath):
+        cache.release(zip_filepath)
+    elif os.path.exists(zip_filepath):
+        os.remove(zip_filepath)
+
+
+class _HostLimiter:
+    # Begrenzt gleichzeitige Downloads pro Host, unabhängig von der Größe des Pools
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+
+class BulkUpdater:
+    # Pipeline für "Alle aktualisieren": mehrere Downloads parallel, Entpacken in eigenem Thread,
+    # sodass das nächste Archiv schon lädt, während das aktuelle installiert wird
+    def __init__(self, mods_folder, max_downloads=MAX_PARALLEL_DOWNLOADS, per_host_limit=MAX_CONNECTIONS_PER_HOST,
+                 session=None, cancel_event=None, progress_callback=None, result_callback=None, delta=True):
+        self.mods_folder = mods_folder
+        self.delta = delta
+        self.max_downloads = max_downloads
+        self.session = session or get_shared_session()
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_callback = progress_callback
+        self.result_callback = result_callback
+
+        self._host_limiter = _HostLimiter(per_host_limit)
+        # Höchstens so viele fertige, aber noch nicht installierte Archive auf der Platte
+        self._pending_slots = threading.BoundedSemaphore(max_downloads + 2)
+        self._lock = threading.Lock()
+        self._bytes = {}
+        self._totals = {}
+        self._finished = 0
+        self._job_count = 0
+        self._targets = {}
+        # (zip_filename, Mod-Ordner) -> Erfolg; results selbst meldet je Archiv nur, ob alle Ziele geklappt haben
+        self.folder_results = {}
+
+    def run(self, jobs, targets=None):
+        # jobs: Liste von (zip_filename, filename_without_zip, remote_version)
+        # targets: optional zip_filename -> Liste von Mod-Ordnern; ein Download wird in alle installiert
+        self._job_count = len(jobs)
+        self._targets = targets or {}
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=1) as install_pool, \
+                ThreadPoolExecutor(max_workers=self.max_downloads) as download_pool:
+
+            def on_downloaded(download_future, job):
+                zip_filepath = download_future.result()
+                if zip_filepath is not None:
+                    install_pool.submit(self._install, job, zip_filepath, results)
+
+            # Der Download-Pool wird zuerst beendet, danach wartet der Installations-Pool auf die letzten Archive
+            for job in jobs:
+                future = download_pool.submit(self._download, job, results)
+                future.add_done_callback(lambda f, job=job: on_downloaded(f, job))
+
+        return results
+
+    def _download(self, job, results):
+        zip_filename, filename_without_zip, remote_version = job
+        self._pending_slots.acquire()
+        try:
+            if self.cancel_event.is_set():
+                raise DownloadCancelled(zip_filename)
+
+            cached_path = find_cached_archive(zip_filename, remote_version)
+            if cached_path:
+                return cached_path
+
+            limiter = self._host_limiter.for_url(f"{DOWNLOAD_BASE_URL}{zip_filename}")
+            with limiter:
+                # Delta lohnt nur für ein einzelnes Ziel; mehrere Installationen teilen sich den Komplett-Download
+                mods_folders = self._targets.get(zip_filename, [self.mods_folder])
+                if self.delta and len(mods_folders) == 1 and try_delta_update(
+                        mods_folders[0], zip_filename, filename_without_zip, self.cancel_event, self.session):
+                    self._pending_slots.release()
+                    self._record_folders(zip_filename, mods_folders, True)
+                    self._record(zip_filename, True, results)
+                    return None
+
+                return download_mod_archive(zip_filename, lambda done, total: self._on_bytes(zip_filename, done, total),
+                                            self.cancel_event, self.session, remote_version)
+        except DownloadCancelled:
+            print(f"⏹️ Download abgebrochen: '{zip_filename}'")
+        except Exception as e:
+            print(f"⚠️ Fehler beim Download '{zip_filename}': {e}")
+
+        self._pending_slots.release()
+        self._record_folders(zip_filename, self._targets.get(zip_filename, [self.mods_folder]), False)
+        self._record(zip_filename, False, results)
+        return None
+
+    def _install(self, job, zip_filepath, results):
+        zip_filename, filename_without_zip, remote_version = job
+        mods_folders = self._targets.get(zip_filename, [self.mods_folder])
+        try:
+            if self.cancel_event.is_set():
+                self._record_folders(zip_filename, mods_folders, False)
+            else:
+                # Ein fehlgeschlagener Ordner hält die übrigen nicht auf
+                for mods_folder in mods_folders:
+                    try:
+                        if not install_prestaged(mods_folder, filename_without_zip, remote_version):
+                            install_mod_archive(zip_filepath, mods_folder, filename_without_zip)
+                        folder_success = True
+                    except Exception as e:
+                        print(f"⚠️ Fehler beim Update '{zip_filename}' in {mods_folder}: {e}")
+                        folder_success = False
+                    self._record_folders(zip_filename, [mods_folder], folder_success)
+        finally:
+            _discard_archive(zip_filepath)
+            self._pending_slots.release()
+
+        with self._lock:
+            success = all(self.folder_results[(zip_filename, mods_folder)] for mods_folder in mods_folders)
+        self._record(zip_filename, success, results)
+
+    def _record_folders(self, zip_filename, mods_folders, success):
+        with self._lock:
+            for mods_folder in mods_folders:
+                self.folder_results[(zip_filename, mods_folder)] = success
+
+    def _on_bytes(self, zip_filename, downloaded, total):
+        with self._lock:
+            self._bytes[zip_filename] = downloaded
+            if total:
+                self._totals[zip_filename] = total
+        self._report()
+
+    def _record(self, zip_filename, success, results):
+        with self._lock:
+            results[zip_filename] = success
+            self._finished += 1
+        if self.result_callback:
+            self.result_callback(zip_filename, success)
+        self._report()
+
+    def _report(self):
+        if not self.progress_callback:
+            return
+        with self._lock:
+            progress = (self._finished, self._job_count, sum(self._bytes.values()), sum(self._totals.values()))
+        self.progress_callback(*progress)
+
+
+class Prefetcher:
+    # Lädt die Archive ausstehender Updates im Leerlauf vor: ein Download nach dem anderen, gedrosselt
+    # und pausierbar. Optional wird schon entpackt, dann ist ein späteres Update nur noch ein Austausch.
+    def __init__(self, mods_folder, bytes_per_second=PREFETCH_BYTES_PER_SECOND, pre_extract=False,
+                 session=None, cancel_event=None, result_callback=None):
+        self.mods_folder = mods_folder
+        self.bytes_per_second = bytes_per_second
+        self.pre_extract = pre_extract
+        self.session = session or get_shared_session()
+        self.cancel_event = cancel_event or threading.Event()
+        self.result_callback = result_callback
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+    def pause(self):
+        self._resume_event.clear()
+
+    def resume(self):
+        self._resume_event.set()
+
+    def run(self, jobs):
+        # jobs wie bei BulkUpdater; vorab Entpacktes, das zu keinem dieser Jobs mehr passt, ist veraltet
+        if self.cancel_event.is_set():
+            return {}  # schon vor dem Start abgelöst – nichts mehr anfassen
+        keep = {filename_without_zip: remote_version for _, filename_without_zip, remote_version in jobs}
+        discard_prestaged(self.mods_folder, keep if self.pre_extract else None)
+
+        # Archive ausstehender Updates dürfen nicht mehr verdrängt werden, die veralteter Versionen schon wieder
+        cache = get_archive_cache()
+        cache.protect((zip_filename, remote_version) for zip_filename, _, remote_version in jobs)
+        self._budget = int(cache.max_bytes * PREFETCH_CACHE_SHARE)
+        self._used_bytes = 0
+        self._budget_exhausted = False
+        self._counted = []
+
+        results = {}
+        for job in jobs:
+            self._wait_while_paused()
+            if self.cancel_event.is_set() or self._budget_exhausted:
+                break
+            zip_filename = job[0]
+            results[zip_filename] = self._prefetch(job)
+            if self.result_callback:
+                self.result_callback(zip_filename, results[zip_filename])
+
+        if self._budget_exhausted:
+            print(f"📥 Vorladen angehalten: Platz für vorgeladene Updates ausgeschöpft "
+                  f"({self._used_bytes / (1024 * 1024):.1f} von {self._budget / (1024 * 1024):.1f} MB)")
+        if not self.cancel_event.is_set():
+            # Geschützt bleibt nur, was ins Budget passt (ein abgelöster Durchlauf überschreibt nichts)
+            cache.protect(self._counted)
+        return results
+
+    def _prefetch(self, job):
+        zip_filename, filename_without_zip, remote_version = job
+        cache = get_archive_cache()
+        # Ohne Version (oder ohne Cache) ließe sich das Archiv später nicht zuordnen
+        if not remote_version or cache.max_bytes <= 0:
+            return False
+
+        # Schon Vorgeladenes zählt ebenfalls gegen das Budget, sonst wüchse es mit jedem Durchlauf
+        archive_size = cache.size_of(zip_filename, remote_version)
+        if self.pre_extract:
+            staged_size = prestaged_size(self.mods_folder, filename_without_zip, remote_version)
+            if staged_size is not None and self._reserve((archive_size or 0) + staged_size):
+                self._count(zip_filename, remote_version, (archive_size or 0) + staged_size)
+                return True
+        elif archive_size is not None and self._reserve(archive_size):
+            self._count(zip_filename, remote_version, archive_size)
+            return True
+        if self._budget_exhausted:
+            return False
+
+        zip_filepath = None
+        try:
+            if archive_size is not None:
+                if not self._reserve(archive_size):
+                    return False
+                zip_filepath = find_cached_archive(zip_filename, remote_version)
+            if zip_filepath is None:
+                # Die Drossel bricht ab, sobald die Größe des Archivs bekannt ist und nicht mehr passt
+                throttle = _Throttle(self.bytes_per_second, self.cancel_event, self._resume_event,
+                                     max_bytes=self._budget - self._used_bytes)
+                zip_filepath = download_mod_archive(zip_filename, throttle, self.cancel_event, self.session,
+                                                    remote_version, download_dir=get_cache_dir("prefetch"))
+            self._count(zip_filename, remote_version, os.path.getsize(zip_filepath))
+
+            if self.pre_extract:
+                extracted_size = _extracted_size(zip_filepath)
+                if self._reserve(extracted_size):
+                    prestage_mod_archive(zip_filepath, self.mods_folder, filename_without_zip, remote_version)
+                    self._used_bytes += extracted_size
+            print(f"📥 Update vorgeladen: {zip_filename} ({remote_version})")
+            return True
+        except _OverBudget:
+            self._budget_exhausted = True
+            _remove_partial_download(zip_filename)
+        except DownloadCancelled:
+            print(f"⏹️ Vorladen abgebrochen: '{zip_filename}'")
+        except Exception as e:
+            print(f"⚠️ Fehler beim Vorladen '{zip_filename}': {e}")
+        finally:
+            _discard_archive(zip_filepath)
+        return False
+
+    def _count(self, zip_filename, remote_version, size):
+        self._used_bytes += size
+        self._counted.append((zip_filename, remote_version))
+
+    def _reserve(self, size):
+        # Passt size noch ins Budget? Sonst endet der Durchlauf nach diesem Job
+        if self._used_bytes + size > self._budget:
+            self._budget_exhausted = True
+            return False
+        return True
+
+    def _wait_while_paused(self):
+        while not self._resume_event.wait(0.5):
+            if self.cancel_event.is_set():
+                return
+
+
+def _remove_partial_download(zip_filename):
+    part_path = os.path.join(get_cache_dir("prefetch"), zip_filename)
+    if not part_path.endswith(".zip"):
+        part_path += ".zip"
+    for path in (f"{part_path}.part", f"{part_path}.part.json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class _OverBudget(Exception):
+    pass
+
+
+class _Throttle:
+    # Fortschritts-Callback, der den Download auf eine Bandbreite begrenzt: liegt er vor dem Soll,
+    # wartet er (der nächste Block wird dann später gelesen). Pausiert außerdem, solange pausiert ist.
+    # Mit max_bytes bricht er ab, sobald das Archiv (laut Content-Length oder tatsächlich) größer wird.
+    def __init__(self, bytes_per_second, cancel_event, resume_event, max_bytes=None):
+        self.bytes_per_second = bytes_per_second
+        self.cancel_event = cancel_event
+        self.resume_event = resume_event
+        self.max_bytes = max_bytes
+        self._start = None
+        self._start_bytes = 0
+
+    def __call__(self, downloaded, total):
+        if self.max_bytes is not None and max(downloaded, total or 0) > self.max_bytes:
+            raise _OverBudget()
+
+        if not self.resume_event.is_set():
+            while not self.resume_event.wait(0.5) and not self.cancel_event.is_set():
+                pass
+            self._start = None  # Pausenzeit zählt nicht als Guthaben
+
+        now = time.monotonic()
+        if self._start is None or downloaded < self._start_bytes:
+            # Erster Aufruf bzw. neuer Versuch: bereits vorhandene Bytes (Resume) nicht mitzählen
+            self._start, self._start_bytes = now, downloaded
+            return
+        if self.bytes_per_second <= 0:
+            return
+
+        delay = (downloaded - self._start_bytes) / self.bytes_per_second - (now - self._start)
+        if delay > 0:
+            self.cancel_event.wait(delay)
@@ -0,0 +1,117 @@
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from get_local_mods import LocalModIndex
+
+DEBOUNCE_MS = 500  # Entpacker und Spiel schreiben viele Dateien kurz hintereinander
+# Jede überwachte Datei kostet ein inotify-Watch bzw. unter Windows ein Handle; darüber hinaus werden
+# Mods nur noch beim Ändern des Mod-Ordners (Hinzufügen, Entfernen, Austauschen per os.replace) geprüft
+MAX_FILE_WATCHES = 1000
+
+
+class ModFolderWatcher(QObject):
+    # Meldet hinzugefügte, entfernte oder geänderte Mod-Ordner, ohne den ganzen Ordner neu zu scannen
+    mods_changed = pyqtSignal(dict)  # Ordnername -> Version oder None (entfernt)
+
+    def __init__(self, mods_folder, parent=None):
+        super().__init__(parent)
+        self.mods_folder = mods_folder
+        self.index = LocalModIndex(mods_folder)
+
+        self._pending = set()
+        self._folder_dirty = False
+        self._unwatched = set()  # Mods ohne eigene mod.lua-Überwachung
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._process_changes)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        if not self._watcher.addPath(mods_folder):
+            print(f"⚠️ Mod-Ordner {mods_folder} kann nicht überwacht werden")
+        self._watch_mods(self.index.entries)
+
+    def reload_index(self):
+        # Nach einem vollständigen Scan den frisch gespeicherten Index übernehmen
+        self.index = LocalModIndex(self.mods_folder)
+        self._unwatched = set()
+        self._watch_mods(self.index.entries)
+
+    def stop(self):
+        self._timer.stop()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _mod_lua_path(self, mod_dir):
+        return os.path.join(self.mods_folder, mod_dir, 'mod.lua')
+
+    def _watch_mods(self, mod_dirs):
+        watched_files = set(self._watcher.files())
+        watched_dirs = set(self._watcher.directories())
+        files, dirs = [], []
+
+        for mod_dir in mod_dirs:
+            mod_path = os.path.join(self.mods_folder, mod_dir)
+            self._unwatched.discard(mod_dir)
+            if mod_dir in self.index.entries:
+                mod_lua_path = self._mod_lua_path(mod_dir)
+                if mod_lua_path not in watched_files:
+                    if len(watched_files) + len(files) < MAX_FILE_WATCHES:
+                        files.append(mod_lua_path)
+                    else:
+                        self._unwatched.add(mod_dir)
+                if mod_path in watched_dirs:
+                    self._watcher.removePath(mod_path)
+            elif os.path.isdir(mod_path) and mod_path not in watched_dirs:
+                # Ordner ohne mod.lua (z.B. mitten im Kopieren) beobachten, bis die Datei auftaucht
+                dirs.append(mod_path)
+
+        # addPaths meldet, was nicht überwacht werden konnte (z.B. inotify-Limit erreicht)
+        failed_files = self._watcher.addPaths(files) if files else []
+        failed_dirs = self._watcher.addPaths(dirs) if dirs else []
+        if failed_files or failed_dirs:
+            print(f"⚠️ {len(failed_files) + len(failed_dirs)} Pfade können nicht überwacht werden – "
+                  f"sie werden bei Änderungen am Mod-Ordner geprüft")
+            self._unwatched.update(os.path.basename(os.path.dirname(path)) for path in failed_files)
+            self._unwatched.update(os.path.basename(path) for path in failed_dirs)
+
+    def _on_directory_changed(self, path):
+        if os.path.normpath(path) == os.path.normpath(self.mods_folder):
+            self._folder_dirty = True
+        else:
+            self._pending.add(os.path.basename(path))
+        self._timer.start()
+
+    def _on_file_changed(self, path):
+        self._pending.add(os.path.basename(os.path.dirname(path)))
+        self._timer.start()
+
+    def _process_changes(self):
+        candidates = self._pending
+        self._pending = set()
+
+        if self._folder_dirty:
+            self._folder_dirty = False
+            try:
+                with os.scandir(self.mods_folder) as dir_entries:
+                    names = {dir_entry.name for dir_entry in dir_entries
+                             if dir_entry.is_dir() and not dir_entry.name.startswith('.')}
+            except OSError:
+                names = set()
+            # Neue und verschwundene Ordner, dazu alle Mods ohne eigene Überwachung (nur ein stat() je Mod)
+            candidates |= names.symmetric_difference(self.index.entries)
+            candidates |= self._unwatched
+
+        if not candidates:
+            return
+
+        changed = self.index.refresh_entries(candidates)
+
+        # Ersetzte Dateien fallen aus der Überwachung heraus, also neu anmelden
+        self._watch_mods(candidates)
+
+        if changed:
+            self.mods_changed.emit({mod_dir: self.index.version_of(mod_dir) for mod_dir in changed})
@@ -0,0 +1,93 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import archive_cache  # noqa: E402
+from archive_cache import ArchiveCache  # noqa: E402
+
+
+class ArchiveCacheEvictionTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="modloader-test-")
+        cache_dir = os.path.join(self.workdir, "archives")
+        os.makedirs(cache_dir)
+        self.cache = ArchiveCache(cache_dir, max_bytes=150)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def store(self, name, fill):
+        source_path = os.path.join(self.workdir, name)
+        with open(source_path, "wb") as file:
+            file.write(fill * 100)
+        return self.cache.store(name, "1.0", source_path)
+
+    def test_pending_archives_survive_eviction_until_released(self):
+        # Wie im BulkUpdater: mehrere Archive geladen, aber noch nicht installiert
+        paths = [self.store(f"mod{index}.zip", bytes([65 + index])) for index in range(3)]
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+        for path in paths:
+            self.cache.release(path)
+
+        # Nach der Freigabe greift die Grenze wieder; das zuletzt benutzte Archiv bleibt
+        self.assertEqual([os.path.exists(path) for path in paths], [False, False, True])
+
+    def test_lookup_pins_until_released(self):
+        first = self.store("mod0.zip", b"A")
+        self.cache.release(first)
+        looked_up = self.cache.lookup("mod0.zip", "1.0")
+        self.assertEqual(looked_up, first)
+
+        second = self.store("mod1.zip", b"B")
+        self.assertTrue(os.path.exists(looked_up))
+
+        self.cache.release(looked_up)
+        self.cache.release(second)
+        self.assertFalse(os.path.exists(looked_up))
+        self.assertTrue(os.path.exists(second))
+
+    def test_store_during_lookup_does_not_evict_the_looked_up_archive(self):
+        # Ein anderer Download-Thread legt ab, während lookup noch die Prüfsumme berechnet
+        self.cache.release(self.store("mod0.zip", b"A"))
+        real_sha256 = archive_cache.file_sha256
+        stored = []
+
+        def sha256_with_concurrent_store(path):
+            if not stored:
+                stored.append(None)  # store() berechnet selbst eine Prüfsumme
+                stored[0] = self.store("mod1.zip", b"B")
+            return real_sha256(path)
+
+        with mock.patch.object(archive_cache, "file_sha256", sha256_with_concurrent_store):
+            looked_up = self.cache.lookup("mod0.zip", "1.0")
+
+        self.assertIsNotNone(looked_up)
+        self.assertTrue(os.path.exists(looked_up))
+        self.cache.release(stored[0])
+        self.assertTrue(os.path.exists(looked_up))
+
+    def test_protected_archives_are_not_evicted(self):
+        # Vorgeladene, noch ausstehende Updates bleiben liegen, auch wenn sie am längsten unbenutzt sind
+        self.cache.max_bytes = 250
+        self.cache.protect([("mod0.zip", "1.0")])
+        paths = [self.store(f"mod{index}.zip", bytes([65 + index])) for index in range(4)]
+        for path in paths:
+            self.cache.release(path)
+        self.assertEqual([os.path.exists(path) for path in paths], [True, False, False, True])
+
+        # Sobald das Update nicht mehr aussteht, gilt wieder die normale Reihenfolge
+        self.cache.protect([])
+        self.cache.release(self.store("mod4.zip", b"E"))
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
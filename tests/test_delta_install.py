@@ -0,0 +1,151 @@
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import zipfile
+from unittest import mock
+
+# Abbruch und Netzwerkfehler mitten im Delta-Update dürfen den installierten Mod nicht verändern.
+#   python -m unittest discover -s tests
+#   python -m pytest tests
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+import requests  # noqa: E402
+import synthetic  # noqa: E402
+import mod_updater  # noqa: E402
+from delta_install import load_manifest  # noqa: E402
+
+MOD_DIR = "delta_mod_1"
+ZIP_FILENAME = f"{MOD_DIR}.zip"
+RES_FILES = [f"res/f{index}.bin" for index in range(1, 6)]
+
+
+def build_archive(version):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr(f"{MOD_DIR}/mod.lua", f"minorVersion = {version}\n")
+        for name in RES_FILES:
+            zip_file.writestr(f"{MOD_DIR}/{name}", f"{name} v{version}\n".encode("utf-8") * 4096)
+        if version == 1:
+            zip_file.writestr(f"{MOD_DIR}/res/old_only.bin", b"nur in v1")
+    return buffer.getvalue()
+
+
+class FlakySession(requests.Session):
+    # Wirft nach fail_after erfolgreichen GET-Anfragen nur noch Verbindungsfehler
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.gets = 0
+
+    def get(self, *args, **kwargs):
+        self.gets += 1
+        if self.gets > self.fail_after:
+            raise requests.ConnectionError("Verbindung verloren")
+        return super().get(*args, **kwargs)
+
+
+class CancelAfter:
+    # Verhält sich wie threading.Event, gilt aber erst nach einigen Abfragen als gesetzt
+    def __init__(self, checks):
+        self.checks = checks
+        self._event = threading.Event()
+
+    def is_set(self):
+        self.checks -= 1
+        if self.checks < 0:
+            self._event.set()
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+class DeltaUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="modloader-test-")
+        self.mods_folder = os.path.join(self.workdir, "mods")
+        os.makedirs(self.mods_folder)
+
+        self.server, base_url = synthetic.start_stand_in_server({"mods": []}, {ZIP_FILENAME: build_archive(1)})
+        patches = [
+            mock.patch.dict(os.environ, {"MODLOADER_CACHE_DIR": os.path.join(self.workdir, "cache")}),
+            mock.patch.object(mod_updater, "DOWNLOAD_BASE_URL", f"{base_url}/download/"),
+            mock.patch.object(mod_updater, "_archive_cache", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        # Archiv-Cache aus, damit wirklich Delta bzw. kompletter Download laufen
+        mod_updater.configure_archive_cache(0)
+        self.assertTrue(mod_updater.update_mod(self.mods_folder, ZIP_FILENAME, MOD_DIR, delta=False))
+        self.server.RequestHandlerClass.files[f"/download/{ZIP_FILENAME}"] = build_archive(2)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def read(self, relative_path):
+        with open(os.path.join(self.mods_folder, MOD_DIR, *relative_path.split("/")), "rb") as file:
+            return file.read()
+
+    def snapshot(self):
+        mod_path = os.path.join(self.mods_folder, MOD_DIR)
+        files = {}
+        for directory, _, names in os.walk(mod_path):
+            for name in names:
+                path = os.path.join(directory, name)
+                with open(path, "rb") as file:
+                    files[os.path.relpath(path, mod_path)] = hashlib.sha256(file.read()).hexdigest()
+        return files, load_manifest(self.mods_folder, MOD_DIR)
+
+    def assert_no_staging_left(self):
+        leftovers = [name for name in os.listdir(mod_updater._staging_parent(self.mods_folder))
+                     if name.startswith(".modloader-staging-")]
+        self.assertEqual(leftovers, [])
+
+    def test_delta_update_replaces_changed_files(self):
+        self.assertTrue(mod_updater.try_delta_update(self.mods_folder, ZIP_FILENAME, MOD_DIR))
+
+        self.assertEqual(self.read("mod.lua"), b"minorVersion = 2\n")
+        self.assertTrue(self.read("res/f3.bin").startswith(b"res/f3.bin v2"))
+        self.assertFalse(os.path.exists(os.path.join(self.mods_folder, MOD_DIR, "res", "old_only.bin")))
+        self.assertNotIn("res/old_only.bin", load_manifest(self.mods_folder, MOD_DIR))
+        self.assert_no_staging_left()
+
+    def test_cancel_mid_delta_leaves_installed_mod_untouched(self):
+        before = self.snapshot()
+
+        # mod.lua wird zuletzt geschrieben; nach zwei Dateien abbrechen
+        result = mod_updater.update_mod(self.mods_folder, ZIP_FILENAME, MOD_DIR, cancel_event=CancelAfter(2))
+
+        self.assertFalse(result)
+        self.assertEqual(self.snapshot(), before)
+        self.assertEqual(self.read("mod.lua"), b"minorVersion = 1\n")
+        self.assert_no_staging_left()
+
+    def test_network_error_mid_delta_and_failed_download_leave_mod_untouched(self):
+        before_files, _ = self.snapshot()
+
+        # Central Directory und die ersten Einträge kommen noch, danach bricht die Verbindung ab –
+        # auch für den anschließenden Komplett-Download
+        result = mod_updater.update_mod(self.mods_folder, ZIP_FILENAME, MOD_DIR, session=FlakySession(fail_after=5))
+
+        self.assertFalse(result)
+        self.assertEqual(self.snapshot()[0], before_files)
+        self.assertEqual(self.read("mod.lua"), b"minorVersion = 1\n")
+        self.assert_no_staging_left()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from mod_table_model import ModTableModel  # noqa: E402
+from update_check import ModRecord  # noqa: E402
+
+REMOTE_VERSION_COLUMN = 2
+
+
+def record(name, remote_version):
+    return ModRecord(name, f"{name.lower()}_mod", "1", "1.0", remote_version, zip_filename=f"{name.lower()}_mod_1.zip")
+
+
+class UpdateModsTest(unittest.TestCase):
+    def setUp(self):
+        self.model = ModTableModel()
+        self.model.set_mods([record("A", "1.1"), record("B", "1.2"), record("C", "1.3")])
+        self.model.sort(REMOTE_VERSION_COLUMN, Qt.AscendingOrder)
+
+    def names(self):
+        return [mod.name for mod in self.model.mods()]
+
+    def test_changed_sort_key_and_new_rows_in_one_refresh(self):
+        inserted, removed, changed = self.model.update_mods(
+            [record("A", "1.9"), record("B", "1.2"), record("C", "1.3"), record("D", "1.25")])
+
+        self.assertEqual([mod.name for mod in inserted], ["D"])
+        self.assertEqual((removed, [mod.name for mod in changed]), (0, ["A"]))
+        self.assertEqual(self.names(), ["B", "D", "C", "A"])
+        self.assertEqual(self.model.row_of_zip("a_mod_1.zip"), 3)
+
+    def test_new_rows_only_keep_order(self):
+        self.model.update_mods([record("A", "1.1"), record("B", "1.2"), record("C", "1.3"), record("D", "1.25")])
+        self.assertEqual(self.names(), ["A", "B", "D", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
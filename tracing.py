@@ -0,0 +1,166 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# Leichtgewichtige Zeitmessung einzelner Phasen (Netzwerk, Parsen, Scan, Abgleich, Tabelle, Download, Entpacken).
+# Aktivieren mit MODLOADER_TRACE=1 oder in der GUI; Export im Chrome-Trace-Format (chrome://tracing, Perfetto).
+
+MAX_EVENTS = 100000
+
+_enabled = os.environ.get("MODLOADER_TRACE", "") not in ("", "0")
+_events = deque(maxlen=MAX_EVENTS)
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+class Span:
+    __slots__ = ("name", "args", "start", "duration")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def add(self, key, amount):
+        self.args[key] = self.args.get(key, 0) + amount
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def add(self, key, amount):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def now():
+    return time.perf_counter()
+
+
+@contextmanager
+def span(name, **args):
+    if not _enabled:
+        yield _NULL_SPAN
+        return
+
+    current = Span(name, args)
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+        thread = threading.current_thread()
+        with _lock:
+            _events.append((current.name, current.start, current.duration, thread.ident, thread.name,
+                            current.args))
+
+
+def traced(name=None):
+    # Dekorator-Variante von span()
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def events_since(start):
+    with _lock:
+        return [event for event in _events if event[1] >= start]
+
+
+def summarize(start):
+    # Phase -> {"seconds", "count", "bytes"} für alle Spans ab start
+    summary = {}
+    for name, _, duration, _, _, args in events_since(start):
+        phase = summary.setdefault(name, {"seconds": 0.0, "count": 0, "bytes": 0})
+        phase["seconds"] += duration
+        phase["count"] += 1
+        phase["bytes"] += args.get("bytes", 0)
+    return summary
+
+
+def format_summary(summary, phases):
+    parts = []
+    for name, label in phases:
+        if name not in summary:
+            continue
+        phase = summary[name]
+        text = f"{label} {phase['seconds'] * 1000:.0f} ms"
+        if phase["bytes"]:
+            text += f" ({phase['bytes'] / (1024 * 1024):.1f} MB)"
+        parts.append(text)
+    return " · ".join(parts)
+
+
+def export_chrome_trace(path):
+    with _lock:
+        events = list(_events)
+
+    pid = os.getpid()
+    trace_events = []
+    thread_names = {}
+    for name, start, duration, thread_id, thread_name, args in events:
+        thread_names[thread_id] = thread_name
+        trace_events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start - _origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": pid,
+            "tid": thread_id,
+            "args": args,
+        })
+    for thread_id, thread_name in thread_names.items():
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                             "args": {"name": thread_name}})
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file, default=str)
+    return path
+
+
+def _export_at_exit():
+    if not _enabled or not _events:
+        return
+    path = os.environ.get("MODLOADER_TRACE_FILE")
+    if not path:
+        from app_paths import get_cache_dir
+        path = os.path.join(get_cache_dir("traces"), f"trace-{datetime.now():%Y%m%d-%H%M%S}.json")
+    try:
+        export_chrome_trace(path)
+        print(f"⏱️ Trace gespeichert: {path}")
+    except OSError as e:
+        print(f"⚠️ Trace konnte nicht gespeichert werden: {e}")
+
+
+atexit.register(_export_at_exit)
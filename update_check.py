@@ -0,0 +1,170 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+FOLDER_VERSION_PATTERN = re.compile(r"(.+?)_(\d+)$")
+UNKNOWN_ZIP_FILENAME = "unbekannt.zip"
+
+
+class ModStatus(NamedTuple):
+    folder_base: str
+    installed: dict  # lokaler Eintrag aus get_mods_versions ({"modOrdner", "version"})
+    available: dict  # Katalogeintrag aus /tpfmm
+    local_version: str
+    remote_version: str
+    needs_update: bool
+
+
+@lru_cache(maxsize=65536)
+def split_foldername_version(folder_fullname):
+    # Regex Muster um _Zahlen (Version) hinten abzutrennen
+    match = FOLDER_VERSION_PATTERN.match(folder_fullname)
+    if match:
+        # (Basisname, Major-Version)
+        return match.group(1), int(match.group(2))
+    else:
+        return folder_fullname, None  # kein Match / keine Zahl hinten
+
+
+@lru_cache(maxsize=65536)
+def parse_version_cached(version_text) -> Optional[object]:
+    # Jede Versionszeichenkette wird nur einmal geparst; packaging erst hier laden, nicht schon beim Start
+    from packaging.version import parse as parse_version, InvalidVersion
+
+    try:
+        return parse_version(version_text)
+    except InvalidVersion as e:
+        print(f"⚠️ Fehler beim Parsen Version '{version_text}': {e}")
+        return None
+
+
+@lru_cache(maxsize=65536)
+def version_needs_update(local_version_text, remote_version_text):
+    # Es gibt nur wenige verschiedene Versionspaare, daher lohnt sich auch das Ergebnis-Caching
+    local_version = parse_version_cached(local_version_text.strip())
+    remote_version = parse_version_cached(remote_version_text.strip() or "0.0")
+
+    if local_version is None or remote_version is None:
+        return False
+    return remote_version > local_version
+
+
+class ModRecord:
+    # Kompakter Eintrag für Tabelle und Updates: nur die Felder, die der Loader braucht,
+    # statt einer Kopie des kompletten Katalogeintrags (Beschreibungen, Dateilisten, ...)
+    __slots__ = ("name", "folder_base", "major_version", "local_version", "remote_version", "created", "changed",
+                 "zip_filename", "needs_update")
+
+    def __init__(self, name, folder_base, major_version, local_version, remote_version, created=0, changed=0,
+                 zip_filename=UNKNOWN_ZIP_FILENAME):
+        self.name = name
+        self.folder_base = folder_base
+        self.major_version = major_version
+        self.remote_version = remote_version
+        self.created = created
+        self.changed = changed
+        self.zip_filename = zip_filename
+        self.set_local_version(local_version)
+
+    @classmethod
+    def from_status(cls, status):
+        entry = status.available
+        major_version = split_foldername_version(status.installed["modOrdner"])[1]
+        return cls(entry.get("name") or "", status.folder_base, major_version, status.local_version,
+                   status.remote_version, entry.get("timecreated") or 0, entry.get("timechanged") or 0,
+                   catalog_zip_filename(entry))
+
+    def set_local_version(self, local_version):
+        # Vergleich einmal hier, Tabelle und Updates lesen nur noch das Flag
+        self.local_version = local_version
+        self.needs_update = version_needs_update(local_version, self.remote_version)
+
+    @property
+    def folder_name(self):
+        if self.major_version is None:
+            return self.folder_base
+        return f"{self.folder_base}_{self.major_version}"
+
+    def __repr__(self):
+        return (f"ModRecord({self.name!r}, {self.folder_name!r}, local={self.local_version!r}, "
+                f"remote={self.remote_version!r}, needs_update={self.needs_update})")
+
+
+def build_local_index(mods_local):
+    # Basisname -> lokaler Eintrag; bei mehreren Major-Versionen gewinnt wie bisher der letzte
+    local_index = {}
+    for mod_loc in mods_local:
+        foldername, _ = split_foldername_version(mod_loc["modOrdner"])
+        local_index[foldername] = mod_loc
+    return local_index
+
+
+def catalog_folder_name(mod_entry):
+    # files könnte mehrere haben, aber laut Beispiel ist es [0]
+    try:
+        return mod_entry["files"][0]["foldername"]
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def catalog_zip_filename(mod_entry):
+    files = mod_entry.get("files") or [{}]
+    return files[0].get("filename", UNKNOWN_ZIP_FILENAME)
+
+
+def catalog_folder_base(mod_entry):
+    folder_fullname = catalog_folder_name(mod_entry)
+    if folder_fullname is None:
+        return None
+    return split_foldername_version(folder_fullname)[0]
+
+
+def diff_mods(mods_json, mods_local):
+    # Ein Durchlauf über den Katalog, Nachschlagen in O(1) – liefert nur installierte Mods
+    local_index = build_local_index(mods_local)
+    statuses = []
+
+    for mod_entry in mods_json:
+        foldername_json = catalog_folder_base(mod_entry)
+        if foldername_json is None:
+            continue
+
+        mod_loc = local_index.get(foldername_json)
+        if mod_loc is None:
+            continue
+
+        local_version = mod_loc["version"]
+        remote_version = mod_entry.get("version", "N/A")
+        if not isinstance(remote_version, str):
+            remote_version = str(remote_version)
+
+        statuses.append(ModStatus(foldername_json, mod_loc, mod_entry, local_version, remote_version,
+                                  version_needs_update(local_version, remote_version)))
+
+    return statuses
+
+
+def outdated(statuses):
+    return [status for status in statuses if status.needs_update]
+
+
+if __name__ == "__main__":
+    import time
+
+    # Kleiner Benchmark mit einem synthetischen Katalog
+    entry_count = 50000
+    mods_json = [{"name": f"Mod {i}", "version": f"{i % 5 + 1}.{i % 9}",
+                  "files": [{"foldername": f"mod_{i}_{i % 5 + 1}", "filename": f"mod_{i}_{i % 5 + 1}.zip"}]}
+                 for i in range(entry_count)]
+    mods_local = [{"modOrdner": f"mod_{i}_{i % 5 + 1}", "version": f"{i % 5 + 1}.{i % 7}"}
+                  for i in range(0, entry_count, 2)]
+
+    # Erster Lauf füllt die Caches, danach zählt der beste von fünf Läufen
+    for run, repeats in (("kalt", 1), ("warm", 5)):
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            statuses = diff_mods(mods_json, mods_local)
+            durations.append(time.perf_counter() - start)
+        print(f"{run}: {len(mods_json)} Katalogeinträge, {len(statuses)} installiert, "
+              f"{len(outdated(statuses))} veraltet in {min(durations) * 1000:.1f} ms")
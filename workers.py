@@ -0,0 +1,224 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QRunnable, QThread, pyqtSignal, pyqtSlot
+from get_local_mods import get_mods_versions
+from tracing import span
+from catalog_search import CatalogSearchIndex
+
+
+class WorkerSignals(QObject):
+    # Signale werden im GUI-Thread zugestellt (QueuedConnection über Threadgrenzen)
+    cached = pyqtSignal(object)
+    batch = pyqtSignal(object)  # Teilergebnis beim Laden ohne zwischengespeicherten Katalog
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(object, object)  # (bytes geladen, bytes gesamt oder None)
+    bulk_progress = pyqtSignal(int, int, object, object)  # (fertig, gesamt, bytes geladen, bytes gesamt)
+    item_finished = pyqtSignal(str, bool)
+
+
+class CancellableWorker(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+
+# Lädt Katalog und lokale Mods parallel und liefert die kombinierte Liste zurück
+class RefreshWorker(CancellableWorker):
+    def __init__(self, mod_folder, merge_func, catalog_cache):
+        super().__init__()
+        self.mod_folder = mod_folder
+        self.merge_func = merge_func
+        self.catalog_cache = catalog_cache
+        self._streamed = False
+
+    @pyqtSlot()
+    def run(self):
+        with span("refresh"):
+            self._refresh()
+
+    def _refresh(self):
+        import requests
+
+        try:
+            # Netzwerk und Festplatte gleichzeitig bemühen
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                local_future = executor.submit(get_mods_versions, self.mod_folder) if self.mod_folder else None
+
+                # Ohne zwischengespeicherten Katalog die Tabelle schon während des Downloads füllen
+                cached_mods = self.catalog_cache.load_cached()
+                on_entries = None
+                if cached_mods is None:
+                    on_entries = lambda entries: self._emit_batch(entries, local_future)
+                catalog_future = executor.submit(self.catalog_cache.fetch, on_entries)
+
+                mods_local = local_future.result() if local_future else []
+
+                # Solange die Revalidierung läuft, schon mal den zwischengespeicherten Katalog anzeigen
+                shown_cached = False
+                if cached_mods is not None and not catalog_future.done() and not self.is_cancelled():
+                    self.signals.cached.emit(self.merge_func(cached_mods, mods_local))
+                    shown_cached = True
+
+                mods_json = catalog_future.result()
+
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+
+            if (shown_cached and mods_json is cached_mods) or self._streamed:
+                # 304 bzw. schon stückweise geliefert – die angezeigte Liste ist aktuell
+                combined_mods = None
+            else:
+                combined_mods = self.merge_func(mods_json, mods_local)
+
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+
+            self.signals.finished.emit(combined_mods)
+
+        except requests.RequestException as e:
+            self.signals.error.emit(f"Fehler beim Laden der Daten:\n{e}")
+        except ValueError as e:
+            self.signals.error.emit(f"Katalog ist kein gültiges JSON:\n{e}")
+        except KeyError as e:
+            self.signals.error.emit(f"Datenfeld fehlt in JSON:\n{e}")
+        except Exception as e:
+            self.signals.error.emit(f"Unerwarteter Fehler beim Laden:\n{e}")
+
+    def _emit_batch(self, entries, local_future):
+        # Läuft im Download-Thread; der lokale Scan ist meist längst fertig
+        if self.is_cancelled():
+            return
+        mods_local = local_future.result() if local_future else []
+        self._streamed = True
+        self.signals.batch.emit(self.merge_func(entries, mods_local))
+
+
+# Lädt und installiert einen einzelnen Mod; Fortschritt geht an die Tabellenzeile
+class UpdateWorker(CancellableWorker):
+    def __init__(self, update_func, zip_filename, filename_without_zip, remote_version=None):
+        super().__init__()
+        self.update_func = update_func
+        self.zip_filename = zip_filename
+        self.filename_without_zip = filename_without_zip
+        self.remote_version = remote_version
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            success = self.update_func(self.zip_filename, self.filename_without_zip,
+                                       progress_callback=self.signals.progress.emit,
+                                       cancel_event=self._cancel_event,
+                                       remote_version=self.remote_version)
+        except Exception as e:
+            print(f"⚠️ Fehler beim Update '{self.zip_filename}': {e}")
+            success = False
+
+        self.signals.finished.emit(success)
+
+
+# "Alle aktualisieren": speist alle veralteten Mods in die BulkUpdater-Pipeline
+class BulkUpdateWorker(CancellableWorker):
+    def __init__(self, mod_folder, jobs):
+        super().__init__()
+        self.mod_folder = mod_folder
+        self.jobs = jobs
+
+    @pyqtSlot()
+    def run(self):
+        from mod_updater import BulkUpdater
+
+        updater = BulkUpdater(self.mod_folder, cancel_event=self._cancel_event,
+                              progress_callback=self.signals.bulk_progress.emit,
+                              result_callback=self.signals.item_finished.emit)
+        results = updater.run(self.jobs)
+        self.signals.finished.emit(results)
+
+
+# Lädt ausstehende Updates im Leerlauf vor; läuft mit niedrigster Thread-Priorität
+class PrefetchWorker(CancellableWorker):
+    def __init__(self, mod_folder, jobs, bytes_per_second, pre_extract=False):
+        super().__init__()
+        from mod_updater import Prefetcher
+
+        self.jobs = jobs
+        self.prefetcher = Prefetcher(mod_folder, bytes_per_second, pre_extract, cancel_event=self._cancel_event,
+                                     result_callback=self.signals.item_finished.emit)
+
+    def pause(self):
+        self.prefetcher.pause()
+
+    def resume(self):
+        self.prefetcher.resume()
+
+    @pyqtSlot()
+    def run(self):
+        # Pool-Threads werden wiederverwendet, daher die Priorität hinterher zurücksetzen
+        thread = QThread.currentThread()
+        previous_priority = thread.priority()
+        if previous_priority == QThread.InheritPriority:
+            previous_priority = QThread.NormalPriority  # lässt sich nicht wieder setzen
+        thread.setPriority(QThread.IdlePriority)
+        try:
+            with span("prefetch", jobs=len(self.jobs)):
+                results = self.prefetcher.run(self.jobs)
+        except Exception as e:
+            print(f"⚠️ Vorladen fehlgeschlagen: {e}")
+            results = {}
+        finally:
+            thread.setPriority(previous_priority)
+
+        if not self.is_cancelled():
+            self.signals.finished.emit(results)
+
+
+# Prüft im Hintergrund, ob es eine neuere Version des Mod Loaders gibt
+class AppUpdateCheckWorker(CancellableWorker):
+    def __init__(self, check_func, current_version):
+        super().__init__()
+        self.check_func = check_func
+        self.current_version = current_version
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.check_func(self.current_version)
+        except Exception as e:
+            print(f"⚠️ Update-Prüfung fehlgeschlagen: {e}")
+            return
+
+        if not self.is_cancelled():
+            self.signals.finished.emit(result)
+
+
+# Baut den Suchindex über den kompletten Katalog, ohne die Oberfläche zu blockieren
+class CatalogIndexWorker(CancellableWorker):
+    def __init__(self, catalog_cache):
+        super().__init__()
+        self.catalog_cache = catalog_cache
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            mods_json = self.catalog_cache.load_cached()
+            if mods_json is None:
+                self.signals.error.emit("Katalog noch nicht geladen – bitte zuerst auffrischen.")
+                return
+            with span("build_catalog_index", entries=len(mods_json)):
+                search_index = CatalogSearchIndex(mods_json)
+        except Exception as e:
+            self.signals.error.emit(f"Suchindex konnte nicht erstellt werden:\n{e}")
+            return
+
+        if not self.is_cancelled():
+            self.signals.finished.emit(search_index)